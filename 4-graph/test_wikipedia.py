@@ -0,0 +1,337 @@
+import concurrent.futures
+import contextlib
+import io
+import json
+import os
+import pickle
+import random
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import numpy as np
+
+import wikipedia as wikipedia_module
+from wikipedia import CSRWikipedia, Wikipedia
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# Build a graph without printing the progress messages.
+def quietly(cls, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return cls(*args, **kwargs)
+
+
+# Open a graph, with its snapshot, and return the shortest paths of |pairs|.
+# Run in worker processes.
+def find_paths(pages_file, links_file, pairs):
+    return quietly(CSRWikipedia, pages_file, links_file).find_shortest_paths(pairs)
+
+
+# Return what the method |name| of |wikipedia| prints.
+def printed(wikipedia, name):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        getattr(wikipedia, name)()
+    return output.getvalue()
+
+
+# Return the (title, rank) pairs printed by find_most_popular_pages(). The
+# "diff" lines before them are left out: they depend on the order in which
+# the ranks are summed.
+def popular_pages(wikipedia):
+    output = printed(wikipedia, "find_most_popular_pages")
+    lines = output.split("Top 10 most popular pages:\n")[1].split("\n")
+    return [
+        (title, float(rank))
+        for (title, rank) in (line.split(" , rank: ") for line in lines if line)
+    ]
+
+
+class TestCSRWikipedia(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    # Write |pages| and |links| to files in the temporary directory.
+    # return: str: pages_file, str: links_file
+    def write_graph(self, pages, links):
+        pages_file = os.path.join(self.tmp.name, "pages.txt")
+        links_file = os.path.join(self.tmp.name, "links.txt")
+        with open(pages_file, "w", encoding="utf-8") as file:
+            file.writelines("%d %s\n" % page for page in pages)
+        with open(links_file, "w") as file:
+            file.writelines("%d %d\n" % link for link in links)
+        return pages_file, links_file
+
+    # Write a seeded random graph with a few isolated pages.
+    def write_random_graph(self, seed, num_pages=300, num_links=900):
+        rng = random.Random(seed)
+        ids = rng.sample(range(1, 10 * num_pages), num_pages)
+        pages = [(id, "P%d" % id) for id in ids]
+        linked = ids[: num_pages - 5]
+        links = [
+            (rng.choice(linked), rng.choice(linked)) for _ in range(num_links)
+        ]
+        return self.write_graph(pages, links)
+
+    # Check the shortest paths of |csr| against the BFS of |wikipedia|.
+    def check_paths(self, csr, wikipedia, pairs):
+        for start, goal in pairs:
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = wikipedia.find_shortest_path(start, goal)
+                (path_length, path) = csr.find_shortest_path(start, goal)
+            if start == goal:
+                self.assertEqual((path_length, path), (1, [start]))
+                continue
+            self.assertEqual(path_length, expected[0], (start, goal))
+            self.assertEqual(path_length, len(path))
+            if path:
+                self.assertEqual((path[0], path[-1]), (start, goal))
+            for src, dst in zip(path, path[1:]):
+                self.assertIn(wikipedia.ids[dst], wikipedia.links[wikipedia.ids[src]])
+
+    def test_titles_with_other_spaces(self):
+        # Ideographic spaces are part of the title, as in Wikipedia.
+        pages = [(1, "A"), (2, "東京　駅"), (3, "B　C"), (5, "D")]
+        files = self.write_graph(pages, [(1, 2), (2, 3), (3, 5)])
+        wikipedia = quietly(CSRWikipedia, *files, cache=False)
+        self.assertEqual(wikipedia.titles, dict(pages))
+        self.assertEqual(wikipedia.titles, quietly(Wikipedia, *files).titles)
+
+    def test_malformed_links(self):
+        (pages_file, links_file) = self.write_graph([(1, "A"), (2, "B")], [])
+        for links in ("1 2 3\n4\n", "1 2\n2\n", "1 2\n\n2 1\n", "1  2\n"):
+            with open(links_file, "w") as file:
+                file.write(links)
+            with self.assertRaises(AssertionError, msg=links):
+                quietly(CSRWikipedia, pages_file, links_file, cache=False)
+        # The last line does not need a newline.
+        with open(links_file, "w") as file:
+            file.write("1 2\n2 1")
+        wikipedia = quietly(CSRWikipedia, pages_file, links_file, cache=False)
+        self.assertEqual(wikipedia.indices.tolist(), [1, 0])
+
+    def test_shortest_paths_on_small_graph(self):
+        files = (
+            os.path.join(HERE, "pages_small.txt"),
+            os.path.join(HERE, "links_small.txt"),
+        )
+        csr = quietly(CSRWikipedia, *files, cache=False)
+        wikipedia = quietly(Wikipedia, *files)
+        self.check_paths(csr, wikipedia, [(s, g) for s in csr.ids for g in csr.ids])
+
+    def test_most_linked_and_popular_pages_on_small_graph(self):
+        files = (
+            os.path.join(HERE, "pages_small.txt"),
+            os.path.join(HERE, "links_small.txt"),
+        )
+        csr = quietly(CSRWikipedia, *files, cache=False)
+        wikipedia = quietly(Wikipedia, *files)
+        self.assertEqual(
+            printed(csr, "find_most_linked_pages"),
+            printed(wikipedia, "find_most_linked_pages"),
+        )
+        self.assertEqual(popular_pages(csr), popular_pages(wikipedia))
+
+    def test_pages_without_incoming_links_keep_their_rank(self):
+        files = (
+            os.path.join(HERE, "pages_test.txt"),
+            os.path.join(HERE, "links_test.txt"),
+        )
+        csr = quietly(CSRWikipedia, *files, cache=False)
+        wikipedia = quietly(Wikipedia, *files)
+        self.assertEqual(
+            printed(csr, "find_most_linked_pages"),
+            printed(wikipedia, "find_most_linked_pages"),
+        )
+        # A and F have no incoming links. Wikipedia drops them from the
+        # ranks, and so loses their share of the rank on every iteration.
+        ranks = dict(popular_pages(csr))
+        expected = dict(popular_pages(wikipedia))
+        self.assertEqual((expected["A"], expected["F"]), (0, 0))
+        self.assertLess(sum(expected.values()), 0.01)
+        self.assertAlmostEqual(ranks["A"], ranks["F"])
+        self.assertGreater(ranks["A"], 0.15)
+        # With them, the ranks keep their total, one per page.
+        self.assertAlmostEqual(sum(ranks.values()), len(ranks), delta=1e-3)
+        self.assertEqual(
+            [title for title, _ in popular_pages(csr)], list("EDBCAF")
+        )
+
+    def test_shortest_paths_on_random_graph(self):
+        files = self.write_random_graph(seed=1)
+        csr = quietly(CSRWikipedia, *files, cache=False)
+        wikipedia = quietly(Wikipedia, *files)
+        rng = random.Random(2)
+        titles = sorted(csr.ids)
+        pairs = [tuple(rng.sample(titles, 2)) for _ in range(300)]
+        self.check_paths(csr, wikipedia, pairs + [(titles[0], titles[0])])
+
+    def test_no_path(self):
+        files = self.write_graph(
+            [(1, "A"), (2, "B"), (3, "C"), (4, "D")], [(1, 2), (2, 1), (3, 4)]
+        )
+        csr = quietly(CSRWikipedia, *files, cache=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(csr.find_shortest_path("A", "C"), (0, []))
+            self.assertEqual(csr.find_shortest_path("D", "C"), (0, []))
+            self.assertEqual(csr.find_shortest_path("C", "D"), (2, ["C", "D"]))
+
+    def test_batch_matches_single_queries(self):
+        csr = quietly(CSRWikipedia, *self.write_random_graph(seed=3), cache=False)
+        rng = random.Random(4)
+        titles = sorted(csr.ids)
+        # Few start pages, so that each has many goals.
+        pairs = [(rng.choice(titles[:3]), rng.choice(titles)) for _ in range(200)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = [csr.find_shortest_path(s, g) for s, g in pairs]
+        for minimum in (1, len(pairs) + 1):
+            # 1 forces the multi-goal BFS, the other the bidirectional one.
+            multi_goal_search = mock.Mock(wraps=csr.multi_goal_search)
+            with mock.patch.object(
+                wikipedia_module, "MULTI_GOAL_SEARCH_MIN", minimum
+            ), mock.patch.object(csr, "multi_goal_search", multi_goal_search):
+                csr.path_cache.clear()
+                results = csr.find_shortest_paths(pairs)
+            self.assertEqual(multi_goal_search.called, minimum == 1)
+            self.assertEqual([(r.start, r.goal) for r in results], pairs)
+            self.assertEqual(
+                [r.path_length for r in results], [e[0] for e in expected]
+            )
+            for result in results:
+                self.assertEqual(result.path_length, len(result.path))
+
+    def test_batch_rejects_unknown_titles(self):
+        csr = quietly(CSRWikipedia, *self.write_random_graph(seed=5), cache=False)
+        title = sorted(csr.ids)[0]
+        with self.assertRaises(KeyError):
+            csr.find_shortest_paths([(title, title), (title, "no such page")])
+        with self.assertRaises(KeyError):
+            csr.find_shortest_paths([("no such page", title)])
+
+    def test_cache_size_is_bounded(self):
+        csr = quietly(CSRWikipedia, *self.write_random_graph(seed=6), cache=False)
+        titles = sorted(csr.ids)
+        pairs = [(titles[i], titles[-i]) for i in range(1, 40)]
+        with mock.patch.object(wikipedia_module, "PATH_CACHE_SIZE", 10):
+            results = csr.find_shortest_paths(pairs)
+            self.assertEqual(len(csr.path_cache), 10)
+            # The latest results are kept, and the cached ones are reused.
+            self.assertEqual(list(csr.path_cache), pairs[-10:])
+            self.assertEqual(csr.find_shortest_paths(pairs[-3:]), results[-3:])
+            self.assertEqual(len(csr.path_cache), 10)
+
+    def test_server(self):
+        csr = quietly(CSRWikipedia, *self.write_random_graph(seed=7), cache=False)
+        server = csr.make_server(0)
+        server.RequestHandlerClass.log_message = lambda *args: None
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = "http://127.0.0.1:%d/" % server.server_port
+
+        def post(data):
+            request = urllib.request.Request(url, data=data, method="POST")
+            try:
+                with urllib.request.urlopen(request) as response:
+                    return response.status, json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                return e.code, json.loads(e.read())
+
+        title = sorted(csr.ids)[0]
+        (status, reply) = post(json.dumps({"pairs": [[title, title]]}).encode())
+        self.assertEqual(status, 200)
+        self.assertEqual(reply["paths"][0]["path"], [title])
+        for bad in (b"not json", b'{"no pairs": 1}', b'{"pairs": [["x", "y"]]}'):
+            (status, reply) = post(bad)
+            self.assertEqual(status, 400)
+            self.assertIn("error", reply)
+
+    def test_snapshot(self):
+        pages = [(1, "A"), (2, "B"), (3, "C")]
+        (pages_file, links_file) = self.write_graph(pages, [(1, 2), (2, 3)])
+
+        def load():
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                csr = CSRWikipedia(pages_file, links_file)
+            return csr, "Finished reading %s\n" % links_file in output.getvalue()
+
+        (csr, parsed) = load()
+        self.assertTrue(parsed)
+        self.assertTrue(os.path.isdir(links_file + ".csr"))
+        (csr, parsed) = load()
+        self.assertFalse(parsed)
+        for name in ("indptr", "indices", "reverse_indptr", "reverse_indices"):
+            self.assertIsInstance(getattr(csr, name), np.memmap)
+            self.assertFalse(getattr(csr, name).flags.writeable)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(csr.find_shortest_path("A", "C"), (3, ["A", "B", "C"]))
+
+        # Unpickling maps the snapshot again instead of copying the arrays.
+        data = pickle.dumps(csr)
+        self.assertLess(len(data), 1000)
+        copy = pickle.loads(data)
+        self.assertIsInstance(copy.indices, np.memmap)
+        self.assertEqual(copy.titles, csr.titles)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(copy.find_shortest_path("A", "C"), (3, ["A", "B", "C"]))
+        pairs = [("C", "A"), ("B", "A")]
+        self.assertEqual(
+            copy.find_shortest_paths(pairs), csr.find_shortest_paths(pairs)
+        )
+
+        # A changed links file is parsed again.
+        with open(links_file, "a") as file:
+            file.write("1 3\n")
+        stat = os.stat(links_file)
+        os.utime(links_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        (csr, parsed) = load()
+        self.assertTrue(parsed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(csr.find_shortest_path("A", "C"), (2, ["A", "C"]))
+        (csr, parsed) = load()
+        self.assertFalse(parsed)
+
+    def test_snapshot_saved_by_several_processes_at_once(self):
+        files = self.write_random_graph(seed=8, num_pages=20000, num_links=200000)
+        titles = sorted(quietly(CSRWikipedia, *files, cache=False).ids)
+        pairs = [(titles[i], titles[-i]) for i in range(1, 20)]
+        with concurrent.futures.ProcessPoolExecutor(8) as pool:
+            futures = [pool.submit(find_paths, *files, pairs) for _ in range(8)]
+            results = [future.result() for future in futures]
+        self.assertTrue(all(result == results[0] for result in results))
+        # Only the snapshot is left; no temporary directories.
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)),
+            ["links.txt", "links.txt.csr", "pages.txt"],
+        )
+        self.assertEqual(find_paths(*files, pairs), results[0])
+
+    def test_snapshot_of_other_pages_file(self):
+        (pages_file, links_file) = self.write_graph(
+            [(1, "A"), (2, "B")], [(1, 2)]
+        )
+        quietly(CSRWikipedia, pages_file, links_file)
+        # Same size and mtime, and read with the same links file.
+        other_file = os.path.join(self.tmp.name, "other_pages.txt")
+        with open(other_file, "w") as file:
+            file.write("1 X\n2 Y\n")
+        stat = os.stat(pages_file)
+        os.utime(other_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        other = quietly(CSRWikipedia, other_file, links_file)
+        self.assertEqual(other.titles, {1: "X", 2: "Y"})
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(other.find_shortest_path("X", "Y"), (2, ["X", "Y"]))
+        csr = quietly(CSRWikipedia, pages_file, links_file)
+        self.assertEqual(csr.titles, {1: "A", 2: "B"})
+
+
+if __name__ == "__main__":
+    unittest.main()
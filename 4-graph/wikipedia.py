@@ -1,7 +1,51 @@
 import sys
 import collections
+import http.server
+import json
+import os
+import shutil
+import tempfile
 import numpy as np
 
+# Bytes of the links file parsed at a time.
+CHUNK_SIZE = 1 << 26
+
+# Suffix of the snapshot directory saved next to the links file, and the
+# arrays saved in it.
+SNAPSHOT_SUFFIX = ".csr"
+SNAPSHOT_ARRAYS = (
+    "page_ids",
+    "page_table",
+    "title_data",
+    "indptr",
+    "indices",
+    "reverse_indptr",
+    "reverse_indices",
+)
+
+# CSRWikipedia looks page IDs up in a table if it has at most this many
+# entries per page.
+PAGE_TABLE_RATIO = 8
+
+# CSRWikipedia.find_shortest_paths() finds the paths from a start page with
+# one BFS if there are at least this many of them. A bidirectional search
+# explores so much less than a whole BFS that on a random graph of 1M pages
+# and 20M links, a BFS only paid off from about 500 goals; hubs make the
+# bidirectional search costlier on the real graph.
+MULTI_GOAL_SEARCH_MIN = 200
+
+# Results of CSRWikipedia.find_shortest_paths() kept in its cache.
+PATH_CACHE_SIZE = 100000
+
+# Default port of CSRWikipedia.serve().
+SERVER_PORT = 8000
+
+# A result of CSRWikipedia.find_shortest_paths(). |path| is the titles from
+# |start| to |goal|, or [] if there is no path.
+ShortestPath = collections.namedtuple(
+    "ShortestPath", ["start", "goal", "path_length", "path"]
+)
+
 
 class Node:
     def __init__(self, id=-1, prev=None, val="") -> None:
@@ -29,16 +73,7 @@ class Wikipedia:
         # from the page whose ID is 1234.
         self.links = collections.defaultdict(list)
 
-        # Read the pages file into self.titles.
-        with open(pages_file, "r", encoding="utf-8") as file:
-            for line in file:
-                (id, title) = line.rstrip().split(" ")
-                id = int(id)
-                assert id not in self.titles, id
-                self.titles[id] = title
-                self.ids[title] = id
-                # self.links[id] = []
-        print("Finished reading %s" % pages_file)
+        self.read_pages(pages_file)
 
         # Read the links file into self.links.
         with open(links_file) as file:
@@ -51,6 +86,18 @@ class Wikipedia:
         print("Finished reading %s" % links_file)
         print()
 
+    # Read the pages file into self.titles and self.ids.
+    def read_pages(self, pages_file):
+        with open(pages_file, "r", encoding="utf-8") as file:
+            for line in file:
+                (id, title) = line.rstrip().split(" ")
+                id = int(id)
+                assert id not in self.titles, id
+                self.titles[id] = title
+                self.ids[title] = id
+                # self.links[id] = []
+        print("Finished reading %s" % pages_file)
+
     # Find the longest titles. This is not related to a graph algorithm at all
     # though :)
     def find_longest_titles(self):
@@ -193,7 +240,522 @@ class Wikipedia:
         pass
 
 
+# Return the pages linked from the pages in |frontier| of a CSR graph.
+# return: np.ndarray: children, np.ndarray: the page each child is linked from
+def gather_links(indptr, indices, frontier):
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    # The k-th link of frontier[j] is at starts[j] + k; arange() numbers the
+    # links of all of the frontier one after another.
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    offsets += np.arange(offsets.size)
+    return indices[offsets], np.repeat(frontier, counts)
+
+
+# Return the pages from |page| to the root of the BFS tree |parent|.
+def trace_path(parent, page):
+    path = [page]
+    while parent[path[-1]] != path[-1]:
+        path.append(parent[path[-1]])
+    return path
+
+
+# Expand the BFS |frontier| of a CSR graph by one level, setting parent[i]
+# for every page i reached for the first time.
+# return: np.ndarray: the pages reached for the first time
+def expand_frontier(indptr, indices, parent, frontier):
+    children, sources = gather_links(indptr, indices, frontier)
+    new = parent[children] == -1
+    # A page linked from several pages keeps the first of them.
+    frontier, first = np.unique(children[new], return_index=True)
+    parent[frontier] = sources[new][first]
+    return frontier
+
+
+# Build the CSR arrays of the links src[i] -> dst[i] among |num_pages|
+# pages.
+# return: np.ndarray: indptr, np.ndarray: indices
+def build_csr(src, dst, num_pages):
+    assert len(src) < 2**31, len(src)
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(num_pages + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=num_pages), out=indptr[1:])
+    return indptr, dst[order]
+
+
+# Check that the lines of |data|, the last one maybe without a newline, are
+# each two IDs separated by one space, as the lines of a links file must be.
+# |pairs|: the integers parsed from |data|
+def is_pair_per_line(data, pairs):
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    # The spaces and newlines must alternate, starting with a space.
+    separators = buffer[(buffer == ord(" ")) | (buffer == ord("\n"))]
+    num_lines = (len(separators) + 1) // 2
+    return bool(
+        len(pairs) == 2 * num_lines
+        and len(separators) == 2 * num_lines - (not data.endswith(b"\n"))
+        and (separators[0::2] == ord(" ")).all()
+        and (separators[1::2] == ord("\n")).all()
+    )
+
+
+# Return what a snapshot of the graph read from |pages_file| and
+# |links_file| depends on: the mtimes and sizes of both files, followed by
+# the bytes of the absolute path of the pages file. (The snapshot is saved
+# next to the links file, so its path is already part of the key.)
+def snapshot_sources(pages_file, links_file):
+    (pages, links) = (os.stat(pages_file), os.stat(links_file))
+    path = os.path.abspath(pages_file).encode("utf-8")
+    return np.concatenate(
+        [
+            [pages.st_mtime_ns, pages.st_size, links.st_mtime_ns, links.st_size],
+            np.frombuffer(path, dtype=np.uint8),
+        ]
+    ).astype(np.int64)
+
+
+# Return the sources saved in the directory |snapshot|, or None if there is
+# no readable snapshot.
+def saved_sources(snapshot):
+    try:
+        return np.load(os.path.join(snapshot, "sources.npy"))
+    except (OSError, ValueError):
+        return None
+
+
+class CSRWikipedia(Wikipedia):
+    # The same graph with the links in compressed sparse row (CSR) form.
+    #
+    # Pages are renumbered densely: page i (0 <= i < N) is the page whose ID
+    # is self.page_ids[i], and the pages it links to are
+    # self.indices[self.indptr[i]:self.indptr[i + 1]]. An edge costs 4 bytes
+    # instead of a Python int in a list, which is what makes the large
+    # dataset fit in memory. self.reverse_indptr and self.reverse_indices
+    # hold the links the other way round, for searching back from a page.
+    #
+    # With |cache|, the arrays are also saved as a snapshot directory
+    # |links_file|.csr, which later instances load instead of parsing the
+    # text files for as long as they are read from the same pages file and
+    # the mtimes and sizes of both files are unchanged.
+    # The snapshot is memory-mapped read-only rather than read, so every
+    # process using it shares one copy of the graph in the page cache.
+    def __init__(self, pages_file, links_file, cache=True):
+        self._titles = None
+        self._ids = None
+        self.snapshot = None
+        self.path_cache = collections.OrderedDict()
+        snapshot = links_file + SNAPSHOT_SUFFIX
+        sources = snapshot_sources(pages_file, links_file)
+        if cache and self.load_snapshot(snapshot, sources):
+            print("Finished reading %s" % snapshot)
+            print()
+            return
+
+        self.read_pages(pages_file)
+        self.read_links(links_file)
+        if cache:
+            self.save_snapshot(snapshot, sources)
+            # Drop the private copies of the arrays for the shared ones.
+            self.load_snapshot(snapshot, sources)
+
+    # Pickling a graph opened from a snapshot, e.g. to pass it to worker
+    # processes, only pickles the path of the snapshot. Each process then
+    # maps the same files instead of getting a copy of the arrays.
+    def __getstate__(self):
+        if self.snapshot is None:
+            return self.__dict__
+        return {"snapshot": self.snapshot, "sources": self.sources}
+
+    def __setstate__(self, state):
+        if "snapshot" not in state or state["snapshot"] is None:
+            self.__dict__.update(state)
+            return
+        self._titles = None
+        self._ids = None
+        self.path_cache = collections.OrderedDict()
+        loaded = self.load_snapshot(state["snapshot"], state["sources"])
+        assert loaded, "%s changed" % state["snapshot"]
+
+    # Read the pages file. Page i is the page with the i-th smallest ID.
+    def read_pages(self, pages_file):
+        page_ids, titles = [], []
+        with open(pages_file, "r", encoding="utf-8") as file:
+            for line in file:
+                # Only the first " " separates the ID; a title may contain
+                # other (e.g. ideographic) spaces.
+                (id, _, title) = line.rstrip("\n").partition(" ")
+                page_ids.append(id)
+                titles.append(title)
+        page_ids = np.array(page_ids, dtype=np.int64)
+        order = np.argsort(page_ids, kind="stable")
+        self.page_ids = page_ids[order]
+        duplicated = self.page_ids[1:] == self.page_ids[:-1]
+        assert not duplicated.any(), self.page_ids[1:][duplicated][0]
+        self.page_table = self.build_page_table()
+        self.set_titles([titles[i] for i in order.tolist()])
+        print("Finished reading %s" % pages_file)
+
+    # Fill self.titles and self.ids from the titles of the pages in index
+    # order.
+    def set_titles(self, titles):
+        page_ids = self.page_ids.tolist()
+        self._titles = dict(zip(page_ids, titles))
+        self._ids = dict(zip(titles, page_ids))
+
+    # A snapshot only has the titles as self.title_data, the UTF-8 bytes of
+    # the titles joined by newlines. Making the dicts takes longer than
+    # loading the rest of the snapshot, so it is done on first use.
+    @property
+    def titles(self):
+        if self._titles is None:
+            titles = self.title_data.tobytes().decode("utf-8")
+            self.set_titles(titles.split("\n") if self.page_ids.size else [])
+        return self._titles
+
+    @property
+    def ids(self):
+        self.titles
+        return self._ids
+
+    # Read the links file CHUNK_SIZE bytes at a time. NumPy parses each chunk
+    # and the page IDs are checked and renumbered a chunk at a time, so the
+    # file is never held as Python ints.
+    def read_links(self, links_file):
+        src, dst = [], []
+        rest = b""
+        with open(links_file, "rb") as file:
+            while True:
+                chunk = file.read(CHUNK_SIZE)
+                data = rest + chunk
+                if chunk:
+                    # Keep the last, maybe partial, line for the next chunk.
+                    end = data.rfind(b"\n") + 1
+                    data, rest = data[:end], data[end:]
+                if data:
+                    pairs = np.fromstring(data, dtype=np.int64, sep=" ")
+                    assert is_pair_per_line(data, pairs), "a line without two page IDs"
+                    src.append(self.page_index(pairs[0::2]))
+                    dst.append(self.page_index(pairs[1::2]))
+                if not chunk:
+                    break
+        empty = np.zeros(0, dtype=np.int32)
+        self.build_links(
+            np.concatenate(src or [empty]), np.concatenate(dst or [empty])
+        )
+        print("Finished reading %s" % links_file)
+        print()
+
+    # Save the graph as one .npy file per array in the directory |snapshot|.
+    # |sources|: what the graph was read from, see snapshot_sources()
+    #
+    # The files are written to a new temporary directory, which is then
+    # renamed to |snapshot|, so processes saving the same snapshot at once
+    # never see each other's half-written files. If another process has
+    # published its snapshot first, that one is kept.
+    def save_snapshot(self, snapshot, sources):
+        titles = "\n".join(self.titles[id] for id in self.page_ids.tolist())
+        arrays = {
+            "sources": sources,
+            "page_ids": self.page_ids,
+            "page_table": self.page_table,
+            "title_data": np.frombuffer(titles.encode("utf-8"), dtype=np.uint8),
+            "indptr": self.indptr,
+            "indices": self.indices,
+            "reverse_indptr": self.reverse_indptr,
+            "reverse_indices": self.reverse_indices,
+        }
+        tmp = tempfile.mkdtemp(
+            prefix=os.path.basename(snapshot) + ".",
+            suffix=".tmp",
+            dir=os.path.dirname(os.path.abspath(snapshot)),
+        )
+        try:
+            for name, values in arrays.items():
+                np.save(os.path.join(tmp, name + ".npy"), values)
+            saved = saved_sources(snapshot)
+            if saved is not None and not np.array_equal(saved, sources):
+                # A rename cannot replace a non-empty directory, so an
+                # out-of-date snapshot is moved out of the way first.
+                try:
+                    os.rename(snapshot, tmp + ".old")
+                except OSError:
+                    pass
+                shutil.rmtree(tmp + ".old", ignore_errors=True)
+            try:
+                os.rename(tmp, snapshot)
+            except OSError:
+                pass
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    # Map the directory |snapshot| if it was saved from |sources|. The arrays
+    # are read-only views of the files; nothing is read until it is used.
+    # return: bool: whether it was loaded
+    def load_snapshot(self, snapshot, sources):
+        saved = saved_sources(snapshot)
+        if saved is None or not np.array_equal(saved, sources):
+            return False
+        try:
+            arrays = {
+                name: np.load(os.path.join(snapshot, name + ".npy"), mmap_mode="r")
+                for name in SNAPSHOT_ARRAYS
+            }
+        except OSError:
+            return False
+        self.__dict__.update(arrays)
+        self.snapshot = snapshot
+        self.sources = sources
+        return True
+
+    # Return the dense page indices of the page IDs |ids|.
+    def page_index(self, ids):
+        if self.page_table.size:
+            inside = (ids >= 0) & (ids < len(self.page_table))
+            index = self.page_table[np.where(inside, ids, 0)]
+            known = inside & (index >= 0)
+        else:
+            index = np.searchsorted(self.page_ids, ids)
+            index[index == len(self.page_ids)] = 0
+            known = self.page_ids[index] == ids
+        assert known.all(), ids[~known][0]
+        return index.astype(np.int32)
+
+    # Return an array mapping every page ID to its page index (-1 for IDs
+    # without a page), or an empty one if the IDs are too sparse for it.
+    # Looking IDs up in it is far faster than a binary search.
+    def build_page_table(self):
+        num_pages = len(self.page_ids)
+        if not num_pages or self.page_ids[0] < 0:
+            return np.zeros(0, dtype=np.int32)
+        size = int(self.page_ids[-1]) + 1
+        if size > PAGE_TABLE_RATIO * num_pages + (1 << 20):
+            return np.zeros(0, dtype=np.int32)
+        table = np.full(size, -1, dtype=np.int32)
+        table[self.page_ids] = np.arange(num_pages, dtype=np.int32)
+        return table
+
+    # Build the forward and reverse CSR arrays from the links src[i] -> dst[i].
+    def build_links(self, src, dst):
+        num_pages = len(self.page_ids)
+        self.indptr, self.indices = build_csr(src, dst, num_pages)
+        self.reverse_indptr, self.reverse_indices = build_csr(dst, src, num_pages)
+
+    # Return the dense page indices linked from the page with index |page|.
+    def linked_pages(self, page):
+        return self.indices[self.indptr[page] : self.indptr[page + 1]]
+
+    def find_most_linked_pages(self):
+        link_count = np.bincount(self.indices, minlength=len(self.page_ids))
+        print("The most linked pages are:")
+        link_count_max = link_count.max()
+        for page in np.flatnonzero(link_count == link_count_max):
+            print(self.titles[self.page_ids[page]], link_count_max)
+        print()
+
+    # Find the shortest path.
+    # |start|: The title of the start page.
+    # |goal|: The title of the goal page.
+    # return: int: path_length, list[str]: path
+    def find_shortest_path(self, start, goal):
+        start_page, goal_page = self.page_index(
+            np.array([self.ids[start], self.ids[goal]])
+        )
+        path = self.page_titles(self.bidirectional_search(start_page, goal_page))
+        if not path:
+            print("No path found!")
+            return 0, []
+        print("path_length:", len(path), "\npath:", path)
+        return len(path), path
+
+    # Find the shortest path from page |start_page| to page |goal_page| with
+    # a bidirectional BFS: a search forward from the start and one backward
+    # from the goal along the reverse links, each expanding a whole level at
+    # a time. Each step expands the side with fewer links to follow, and the
+    # search stops at the first page both have reached, so only about the
+    # pages within half the distance of either end are explored.
+    # forward[i] is the page from which page i was reached from the start and
+    # backward[i] the page page i links to on the way to the goal, or -1.
+    # return: list[int]: the pages of the path, [] if there is none
+    def bidirectional_search(self, start_page, goal_page):
+        forward = np.full(len(self.page_ids), -1, dtype=np.int32)
+        backward = np.full(len(self.page_ids), -1, dtype=np.int32)
+        forward[start_page] = start_page
+        backward[goal_page] = goal_page
+        forward_frontier = np.array([start_page], dtype=np.int32)
+        backward_frontier = np.array([goal_page], dtype=np.int32)
+        meeting = start_page if start_page == goal_page else -1
+        while meeting == -1 and forward_frontier.size and backward_frontier.size:
+            forward_links = np.sum(
+                self.indptr[forward_frontier + 1] - self.indptr[forward_frontier]
+            )
+            backward_links = np.sum(
+                self.reverse_indptr[backward_frontier + 1]
+                - self.reverse_indptr[backward_frontier]
+            )
+            if forward_links <= backward_links:
+                forward_frontier = expand_frontier(
+                    self.indptr, self.indices, forward, forward_frontier
+                )
+                met = forward_frontier[backward[forward_frontier] != -1]
+            else:
+                backward_frontier = expand_frontier(
+                    self.reverse_indptr,
+                    self.reverse_indices,
+                    backward,
+                    backward_frontier,
+                )
+                met = backward_frontier[forward[backward_frontier] != -1]
+            # Every page of the first level where the searches meet is on a
+            # shortest path.
+            if met.size:
+                meeting = met[0]
+
+        if meeting == -1:
+            return []
+        path = trace_path(forward, meeting)[::-1]
+        return path + trace_path(backward, meeting)[1:]
+
+    # Find the shortest paths from page |start_page| to each of |goal_pages|
+    # with one BFS, which stops once it has reached all of them.
+    # return: list[list[int]]: the pages of each path, [] if there is none
+    def multi_goal_search(self, start_page, goal_pages):
+        parent = np.full(len(self.page_ids), -1, dtype=np.int32)
+        parent[start_page] = start_page
+        frontier = np.array([start_page], dtype=np.int32)
+        while frontier.size and (parent[goal_pages] == -1).any():
+            frontier = expand_frontier(self.indptr, self.indices, parent, frontier)
+        return [
+            trace_path(parent, goal_page)[::-1] if parent[goal_page] != -1 else []
+            for goal_page in goal_pages
+        ]
+
+    # Find the shortest paths between many pairs of titles without printing
+    # them. The pairs are grouped by start page: a start page with at least
+    # MULTI_GOAL_SEARCH_MIN goals gets one multi_goal_search() for all of
+    # them, and the goals of other start pages get a bidirectional_search()
+    # each. The latest PATH_CACHE_SIZE results are cached.
+    # |pairs|: (start title, goal title) pairs
+    # return: list[ShortestPath]: one result per pair, in the same order
+    def find_shortest_paths(self, pairs):
+        pairs = [tuple(pair) for pair in pairs]
+        results = {}
+        goals = collections.defaultdict(list)
+        for pair in pairs:
+            if pair in self.path_cache:
+                self.path_cache.move_to_end(pair)
+                results[pair] = self.path_cache[pair]
+            elif pair not in results:
+                (start, goal) = pair
+                if start not in self.ids or goal not in self.ids:
+                    raise KeyError(start if start not in self.ids else goal)
+                results[pair] = None
+                goals[start].append(goal)
+
+        for start, start_goals in goals.items():
+            start_page, *goal_pages = self.page_index(
+                np.array([self.ids[title] for title in [start] + start_goals])
+            )
+            if len(goal_pages) >= MULTI_GOAL_SEARCH_MIN:
+                paths = self.multi_goal_search(start_page, np.array(goal_pages))
+            else:
+                paths = [
+                    self.bidirectional_search(start_page, goal_page)
+                    for goal_page in goal_pages
+                ]
+            for goal, path in zip(start_goals, paths):
+                path = self.page_titles(path)
+                result = ShortestPath(start, goal, len(path), path)
+                results[(start, goal)] = result
+                self.path_cache[(start, goal)] = result
+                if len(self.path_cache) > PATH_CACHE_SIZE:
+                    self.path_cache.popitem(last=False)
+        return [results[pair] for pair in pairs]
+
+    # Return the titles of the pages |pages|.
+    def page_titles(self, pages):
+        return [self.titles[id] for id in self.page_ids[pages].tolist()]
+
+    # Serve find_shortest_paths() over HTTP on localhost, so that the graph
+    # stays loaded between requests. POST a JSON object like
+    #   {"pairs": [["渋谷", "パレートの法則"], ...]}
+    # and the reply is
+    #   {"paths": [{"start": ..., "goal": ..., "path_length": ...,
+    #               "path": [...]}, ...]}
+    # or {"error": ...} with status 400.
+    def serve(self, port=SERVER_PORT):
+        server = self.make_server(port)
+        print("Serving on http://127.0.0.1:%d" % server.server_port)
+        server.serve_forever()
+
+    # Return the HTTP server of serve(), not yet serving. Port 0 picks a free
+    # port.
+    def make_server(self, port):
+        wikipedia = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                try:
+                    length = int(self.headers["Content-Length"])
+                    request = json.loads(self.rfile.read(length))
+                    paths = wikipedia.find_shortest_paths(request["pairs"])
+                    (status, reply) = (200, {"paths": [p._asdict() for p in paths]})
+                except (KeyError, TypeError, ValueError) as e:
+                    (status, reply) = (400, {"error": "%s: %s" % (type(e).__name__, e)})
+                data = json.dumps(reply, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return http.server.HTTPServer(("127.0.0.1", port), Handler)
+
+    # PageRank with one np.bincount per iteration. Pages without links give
+    # all of their rank to every page; the others give |damping_factor| of it
+    # to the pages they link to and the rest to every page.
+    def find_most_popular_pages(
+        self, damping_factor=0.85, max_iterations=1000, tol=1.0e-4
+    ):
+        num_pages = len(self.page_ids)
+        out_degree = np.diff(self.indptr)
+        has_links = out_degree > 0
+        page_rank = np.ones(num_pages)
+
+        for iteration in range(max_iterations):
+            rank_share = np.zeros(num_pages)
+            rank_share[has_links] = (
+                damping_factor * page_rank[has_links] / out_degree[has_links]
+            )
+            new_page_rank = np.bincount(
+                self.indices,
+                weights=np.repeat(rank_share, out_degree),
+                minlength=num_pages,
+            )
+            total_rank_share = page_rank[~has_links].sum() + (
+                1 - damping_factor
+            ) * page_rank[has_links].sum()
+            new_page_rank += total_rank_share / num_pages
+
+            diff = np.abs(new_page_rank - page_rank).sum()
+            print("diff", diff)
+            page_rank = new_page_rank
+            if diff < tol:
+                break
+
+        print("Top 10 most popular pages:")
+        for page in np.argsort(-page_rank, kind="stable")[:10]:
+            print(self.titles[self.page_ids[page]], ", rank:", page_rank[page])
+        print()
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        if len(sys.argv) not in (4, 5):
+            print("usage: %s serve pages_file links_file [port]" % sys.argv[0])
+            exit(1)
+        wikipedia = CSRWikipedia(sys.argv[2], sys.argv[3])
+        wikipedia.serve(int(sys.argv[4]) if len(sys.argv) == 5 else SERVER_PORT)
+
     wikipedia = Wikipedia("pages_test.txt", "links_test.txt")
     wikipedia.find_most_linked_pages()
     wikipedia.find_shortest_path("A", "E")
@@ -202,7 +764,7 @@ if __name__ == "__main__":
     # wikipedia.find_most_popular_pages()
     # wikipedia = Wikipedia('pages_medium.txt', 'links_medium.txt')
 
-    wikipedia = Wikipedia("pages_large.txt", "links_large.txt")
+    wikipedia = CSRWikipedia("pages_large.txt", "links_large.txt")
     wikipedia.find_shortest_path("渋谷", "パレートの法則")
     wikipedia.find_most_popular_pages()
 
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Run a solver under a hard time limit and always print a tour.
+
+    python anytime.py lk input_7.csv --time-limit 30 > output_7.csv
+
+The anytime protocol: a solver's solve(cities, deadline=..., callback=...)
+stops by |deadline| (a time.time() value) and calls callback(tour, length)
+whenever it finds a better tour. Solvers that take neither still run; they
+just report nothing until they return.
+"""
+
+import argparse
+import importlib
+import inspect
+import math
+import queue
+import signal
+import sys
+import threading
+import time
+
+from common import print_tour, read_input
+from hilbert import hilbert_tour
+
+# Seconds a solver may overrun its deadline before it is interrupted.
+GRACE = 1.0
+
+
+class TimeUp(Exception):
+    """Raised in the solver when the hard time limit or a signal hits."""
+
+
+class Best:
+    """Callback keeping the best tour reported so far.
+
+    |callback|: optional further callback(tour, length) for each new best.
+    """
+
+    def __init__(self, callback=None):
+        self.tour = None
+        self.length = math.inf
+        self.callback = callback
+
+    def __call__(self, tour, length):
+        if length < self.length:
+            self.tour = tour
+            self.length = length
+            if self.callback is not None:
+                self.callback(tour, length)
+
+
+def solve(solver, cities, deadline, callback=None):
+    """Call solver.solve with the anytime arguments it accepts."""
+    parameters = inspect.signature(solver.solve).parameters
+    kwargs = {}
+    if 'deadline' in parameters:
+        kwargs['deadline'] = deadline
+    if 'callback' in parameters:
+        kwargs['callback'] = callback
+    return solver.solve(cities, **kwargs)
+
+
+def improvements(solver, cities, deadline):
+    """Yield (tour, length) for every better tour |solver| finds.
+
+    The solver runs in a thread and the tours are handed over through a
+    queue, so the caller can consume them as they come.
+    """
+    found = queue.Queue()
+    done = object()
+
+    def run():
+        try:
+            solve(solver, cities, deadline, lambda *best: found.put(best))
+        finally:
+            found.put(done)
+
+    threading.Thread(target=run, daemon=True).start()
+    while (best := found.get()) is not done:
+        yield best
+
+
+def run(solver, cities, time_limit, progress=None):
+    """Run |solver| for at most |time_limit| seconds; return the best tour.
+
+    SIGALRM interrupts the solver GRACE seconds after the deadline, and
+    SIGINT/SIGTERM interrupt it at once; either way the best tour reported so
+    far is returned. If there is none yet, the Hilbert curve tour is.
+    """
+    best = Best(progress)
+    deadline = time.time() + time_limit
+
+    def interrupt(signum, frame):
+        raise TimeUp(signal.Signals(signum).name)
+
+    handlers = {s: signal.signal(s, interrupt)
+                for s in (signal.SIGALRM, signal.SIGINT, signal.SIGTERM)}
+    signal.setitimer(signal.ITIMER_REAL, time_limit + GRACE)
+    try:
+        tour = solve(solver, cities, deadline, best)
+    except TimeUp:
+        tour = best.tour
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        for s, handler in handlers.items():
+            signal.signal(s, handler)
+    if tour is None:
+        tour = hilbert_tour(cities)
+    return tour
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('solver', help='e.g. lk for solver_lk.py')
+    parser.add_argument('input')
+    parser.add_argument('--time-limit', type=float, default=60.0)
+    parser.add_argument('--quiet', action='store_true',
+                        help='do not report new best tours on stderr')
+    args = parser.parse_args(argv)
+
+    solver = importlib.import_module(f'solver_{args.solver}')
+    cities = read_input(args.input)
+    start = time.time()
+
+    def progress(tour, length):
+        print(f'{time.time() - start:8.2f}s  {length:.2f}', file=sys.stderr)
+
+    tour = run(solver, cities, args.time_limit,
+               None if args.quiet else progress)
+    print_tour(tour)
+
+
+if __name__ == '__main__':
+    main()
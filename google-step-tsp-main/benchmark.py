@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Benchmark the solvers and check them against a stored baseline.
+
+Every (solver, instance) pair runs in its own fresh process, so the peak
+memory of one run is not hidden by an earlier one and no state is shared.
+
+    python benchmark.py                        # write benchmark_results.json
+    python benchmark.py --solvers lk sa --sizes 20000
+    python benchmark.py --save-baseline        # accept the results
+    python benchmark.py --baseline benchmark_baseline.json   # check lengths
+    python benchmark.py --save-timings         # time this machine once
+    python benchmark.py --timings benchmark_timings.json     # check times
+
+Only tour lengths are committed in the baseline; times depend on the
+machine, so they are only compared against timings saved on the same one.
+Exits with status 1 if a run is invalid or regressed against the baseline.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Budgets of the solvers that would otherwise run until a deadline. They
+# count work instead of seconds, and the clock gets no limit, so the tour
+# lengths are the same on a fast and a slow machine.
+LK_KICKS = 100
+SA_MOVES = 1_000_000
+MULTISTART_STARTS = 8
+
+# name: (module, keyword arguments of solve(), largest N to run it on)
+SOLVERS = {
+    'random': ('solver_random', {}, None),
+    'greedy': ('solver_greedy', {}, None),
+    'ono': ('solver_ono', {}, None),
+    'mst': ('solver_mst', {}, None),
+    'genetic': ('solver_genetic', {}, 2048),
+    'lk': ('solver_lk', {'time_limit': math.inf, 'kicks': LK_KICKS}, None),
+    'sa': ('solver_sa', {'time_limit': math.inf, 'moves': SA_MOVES}, None),
+    'multistart': ('solver_multistart',
+                   {'time_limit': math.inf, 'starts': MULTISTART_STARTS},
+                   None),
+    'partition': ('solver_partition',
+                  {'workers': 1, 'time_limit': math.inf, 'kicks': LK_KICKS},
+                  None),
+}
+
+DEFAULT_SOLVERS = ('greedy', 'ono', 'lk', 'sa', 'partition')
+
+CHALLENGES = 8
+
+# Sizes of the generated instances run after input_0..7.
+GENERATED_SIZES = (20_000,)
+
+RESULTS_FILE = 'benchmark_results.json'
+BASELINE_FILE = 'benchmark_baseline.json'
+TIMINGS_FILE = 'benchmark_timings.json'
+
+# Fields of a result kept in BASELINE_FILE: none of them depend on the machine.
+BASELINE_FIELDS = ('solver', 'instance', 'n', 'length')
+
+# A run regresses if it is this much longer than the baseline or slower than
+# the saved timings. Short runs also get TIME_SLACK seconds, so timer noise is
+# not a failure.
+LENGTH_TOLERANCE = 0.01
+TIME_TOLERANCE = 0.25
+TIME_SLACK = 0.5
+
+# Functions and methods whose time is charged to each phase. Time spent in
+# none of them (or in worker processes) is charged to 'other'.
+PHASES = {
+    'distance': ('distance_matrix', 'nearest_neighbors'),
+    'construction': ('nearest_neighbor_tour', 'greedy_edges',
+                     'minimum_spanning_tree', 'double_tree_tour',
+                     'christofides_tour', 'hilbert_tour', 'initial_tour',
+                     'create_initial_population', 'partition', 'create_mst',
+                     'create_path'),
+    'local_search': ('improve', 'iterated_local_search', 'two_opt', 'or_opt',
+                     'evolve_population', 'LocalSearch.optimize',
+                     'LocalSearch.iterate', 'SimulatedAnnealing.anneal'),
+}
+
+
+class PhaseTimer:
+    """Wall time per phase. Nested calls are charged to the innermost phase."""
+
+    def __init__(self):
+        self.totals = collections.defaultdict(float)
+        self.stack = ['other']
+        self.mark = time.perf_counter()
+
+    def charge(self):
+        now = time.perf_counter()
+        self.totals[self.stack[-1]] += now - self.mark
+        self.mark = now
+
+    def reset(self):
+        self.totals.clear()
+        self.mark = time.perf_counter()
+
+    def wrap(self, phase, function):
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            self.charge()
+            self.stack.append(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.charge()
+                self.stack.pop()
+        return timed
+
+    def instrument(self):
+        """Wrap the PHASES functions in every loaded module of this repo."""
+        modules = [m for m in list(sys.modules.values())
+                   if os.path.dirname(getattr(m, '__file__', None) or '') == HERE]
+        for module in modules:
+            for phase, names in PHASES.items():
+                for name in names:
+                    owner, _, attr = name.rpartition('.')
+                    target = getattr(module, owner, None) if owner else module
+                    # Methods are patched once, in the module defining them.
+                    if owner and (not isinstance(target, type)
+                                  or target.__module__ != module.__name__):
+                        continue
+                    function = vars(target).get(attr)
+                    if callable(function) and not hasattr(function,
+                                                          '__wrapped__'):
+                        setattr(target, attr, self.wrap(phase, function))
+
+
+def load_instance(instance):
+    if instance.startswith('random_'):
+        from input_generator import generate_cities
+        n = int(instance[len('random_'):])
+        return list(generate_cities(n, seed=n))
+    from common import read_input
+    return read_input(os.path.join(HERE, f'{instance}.csv'))
+
+
+def run_one(solver, instance):
+    """Run one solver on one instance; meant to run in a fresh process."""
+    sys.path.insert(0, HERE)
+    module_name, kwargs, _ = SOLVERS[solver]
+    record = {'solver': solver, 'instance': instance}
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        record['skipped'] = str(e)
+        return record
+    import output_verifier
+
+    timer = PhaseTimer()
+    timer.instrument()
+    cities = load_instance(instance)
+    record['n'] = len(cities)
+    timer.reset()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull), \
+            contextlib.redirect_stderr(devnull):
+        tour = module.solve(cities, **kwargs)
+    record['seconds'] = time.perf_counter() - start
+    timer.charge()
+    record['phases'] = dict(timer.totals)
+    # ru_maxrss is in KiB on Linux.
+    record['peak_rss_mb'] = (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+    tour = np.asarray(tour, dtype=np.int64)
+    record['valid'] = output_verifier.is_permutation(tour, len(cities))
+    if record['valid']:
+        record['length'] = output_verifier.path_length(
+            tour, np.asarray(cities, dtype=np.float64))
+    return record
+
+
+def run_benchmark(solvers, instances):
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(
+            1, mp_context=context, max_tasks_per_child=1) as pool:
+        for solver in solvers:
+            limit = SOLVERS[solver][2]
+            for instance, n in instances:
+                if limit is not None and n > limit:
+                    continue
+                record = pool.submit(run_one, solver, instance).result()
+                results.append(record)
+                print(format_record(record), flush=True)
+    return results
+
+
+def format_record(record):
+    name = f"{record['solver']:>10} {record['instance']:>12}"
+    if 'skipped' in record:
+        return f"{name}  skipped: {record['skipped']}"
+    if not record['valid']:
+        return f"{name}  INVALID TOUR"
+    phases = ' '.join(f'{phase}={seconds:.2f}s'
+                      for phase, seconds in sorted(record['phases'].items()))
+    return (f"{name} {record['length']:>14.2f} {record['seconds']:>8.2f}s "
+            f"{record['peak_rss_mb']:>7.1f}MB  {phases}")
+
+
+def find_regressions(results, baseline, timings=()):
+    """Return a message for every run that is invalid or worse than before.
+
+    Lengths are compared with |baseline| and times with |timings|, results
+    saved earlier on the same machine.
+    """
+    previous = {(r['solver'], r['instance']): r for r in baseline
+                if 'length' in r}
+    previous_times = {(r['solver'], r['instance']): r for r in timings
+                      if 'seconds' in r}
+    problems = []
+    for record in results:
+        if 'skipped' in record:
+            continue
+        key = (record['solver'], record['instance'])
+        if not record['valid']:
+            problems.append(f'{key}: invalid tour')
+            continue
+        old = previous.get(key)
+        if (old is not None
+                and record['length'] > old['length'] * (1 + LENGTH_TOLERANCE)):
+            problems.append(f"{key}: length {record['length']:.2f} > "
+                            f"baseline {old['length']:.2f}")
+        old = previous_times.get(key)
+        if (old is not None and record['seconds']
+                > old['seconds'] * (1 + TIME_TOLERANCE) + TIME_SLACK):
+            problems.append(f"{key}: time {record['seconds']:.2f}s > "
+                            f"saved {old['seconds']:.2f}s")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--solvers', nargs='+', choices=sorted(SOLVERS),
+                        default=DEFAULT_SOLVERS)
+    parser.add_argument('--challenges', nargs='+', type=int,
+                        default=range(CHALLENGES))
+    parser.add_argument('--sizes', nargs='+', type=int,
+                        default=GENERATED_SIZES,
+                        help='sizes of generated random instances')
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--baseline',
+                        help='fail on longer tours than in this baseline')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f'also write the tour lengths to {BASELINE_FILE}')
+    parser.add_argument('--timings',
+                        help='fail on slower runs than in these timings, '
+                             'saved on this machine')
+    parser.add_argument('--save-timings', action='store_true',
+                        help=f'also write the results to {TIMINGS_FILE}')
+    args = parser.parse_args(argv)
+
+    instances = []
+    from common import load_cities
+    for i in args.challenges:
+        instances.append((f'input_{i}',
+                          len(load_cities(os.path.join(HERE, f'input_{i}.csv')))))
+    instances += [(f'random_{n}', n) for n in args.sizes]
+
+    results = run_benchmark(args.solvers, instances)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=1)
+    if args.save_baseline:
+        baseline = [{field: r[field] for field in BASELINE_FIELDS if field in r}
+                    for r in results if 'length' in r]
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(baseline, f, indent=1)
+    if args.save_timings:
+        with open(TIMINGS_FILE, 'w') as f:
+            json.dump(results, f, indent=1)
+
+    baseline = timings = ()
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.timings:
+        with open(args.timings) as f:
+            timings = json.load(f)
+    problems = find_regressions(results, baseline, timings)
+    for problem in problems:
+        print(f'REGRESSION {problem}')
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
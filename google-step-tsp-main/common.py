@@ -1,12 +1,50 @@
+import os
+
+import numpy as np
+
+
 def read_input(filename):
+    if filename.endswith('.npy'):
+        return [tuple(xy) for xy in np.load(filename).tolist()]
     with open(filename) as f:
         cities = []
-        for line in f.readlines()[1:]:  # Ignore the first line.
+        next(f, None)  # Ignore the first line.
+        for line in f:
             xy = line.split(',')
             cities.append((float(xy[0]), float(xy[1])))
         return cities
 
 
+def load_cities(filename, cache=False):
+    """Return the cities of |filename| as an (N, 2) float64 array.
+
+    NumPy's parser reads the file in chunks straight into the array, with no
+    list of lines or tuples in between, so it is about twice as fast as
+    read_input() and needs a fraction of the memory.
+
+    With |cache|, the array is also saved next to the input as
+    |filename|.npy, with the same mtime as the input. Later calls
+    memory-map that file instead of parsing, for as long as the mtimes
+    match. A .npy input (see input_generator.py) is memory-mapped directly.
+    """
+    if filename.endswith('.npy'):
+        return np.load(filename, mmap_mode='r')
+    if cache:
+        sidecar = f'{filename}.npy'
+        mtime = os.stat(filename).st_mtime_ns
+        if os.path.exists(sidecar) and os.stat(sidecar).st_mtime_ns == mtime:
+            return np.load(sidecar, mmap_mode='r')
+    cities = np.loadtxt(filename, dtype=np.float64, delimiter=',',
+                        skiprows=1, ndmin=2).reshape(-1, 2)
+    if cache:
+        tmp = f'{sidecar}.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, cities)
+        os.utime(tmp, ns=(mtime, mtime))
+        os.replace(tmp, sidecar)
+    return cities
+
+
 def format_tour(tour):
     return 'index\n' + '\n'.join(map(str, tour))
 
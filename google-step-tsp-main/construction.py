@@ -0,0 +1,252 @@
+import numpy as np
+
+from neighbors import SpatialGrid, nearest_neighbors, octant_neighbors
+from unionFind import unionFind
+
+# Candidate neighbors per city for the sparse edge graphs below.
+NUM_NEIGHBORS = 10
+
+# Rows of the distance block computed at once when joining MST components.
+BLOCK_ENTRIES = 1 << 20
+
+
+def candidate_edges(cities, neighbors):
+    """Return the k-nearest-neighbor edges (u < v) sorted by length.
+
+    return: two lists |us| and |vs|; edge i joins us[i] and vs[i].
+    """
+    coords = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+    N = len(coords)
+    us = np.repeat(np.arange(N), [len(nb) for nb in neighbors])
+    vs = np.fromiter((v for nb in neighbors for v in nb), dtype=np.int64,
+                     count=len(us))
+    pairs = np.unique(np.column_stack((np.minimum(us, vs),
+                                       np.maximum(us, vs))), axis=0)
+    us, vs = pairs[:, 0], pairs[:, 1]
+    weights = np.hypot(coords[us, 0] - coords[vs, 0],
+                       coords[us, 1] - coords[vs, 1])
+    order = np.argsort(weights, kind='stable')
+    return us[order].tolist(), vs[order].tolist()
+
+
+def _subset_edges(cities, subset, k=NUM_NEIGHBORS):
+    """Return the candidate edges among |subset|, in city indices."""
+    neighbors = nearest_neighbors([cities[i] for i in subset], k)
+    us, vs = candidate_edges([cities[i] for i in subset], neighbors)
+    return [subset[u] for u in us], [subset[v] for v in vs]
+
+
+def greedy_edges(cities, neighbors=None):
+    """Return the adjacency lists of a greedy-edge tour.
+
+    Edges are taken shortest first as long as no city gets more than two and
+    no cycle closes early, the same rule as sorting all N^2 edges, but only
+    the k-nearest-neighbor edges are considered. The path fragments that are
+    left are joined the same way using candidate edges between fragment
+    ends, until one Hamiltonian path remains; its two ends are then linked.
+    """
+    N = len(cities)
+    adj = [[] for _ in range(N)]
+    if N < 2:
+        return adj
+    if neighbors is None:
+        neighbors = nearest_neighbors(cities, NUM_NEIGHBORS)
+    uf = unionFind(N)
+    us, vs = candidate_edges(cities, neighbors)
+    while True:
+        for u, v in zip(us, vs):
+            # Not to create a cycle and not to have more than 2 edges
+            if len(adj[u]) < 2 and len(adj[v]) < 2 and uf.unite(u, v):
+                adj[u].append(v)
+                adj[v].append(u)
+        if uf.components == 1:
+            break
+        # Every end sees an end of another fragment among its candidates, so
+        # each round joins at least one pair of fragments.
+        ends = [i for i in range(N) if len(adj[i]) < 2]
+        us, vs = _subset_edges(cities, ends)
+
+    ends = [i for i in range(N) if len(adj[i]) == 1]
+    adj[ends[0]].append(ends[1])
+    adj[ends[1]].append(ends[0])
+    return adj
+
+
+def minimum_spanning_tree(cities, neighbors=None):
+    """Return the adjacency lists of a Euclidean minimum spanning tree.
+
+    A first spanning tree comes from the k-nearest-neighbor edges (see
+    _spanning_tree()). It can miss MST edges even when those edges connect
+    the graph, e.g. between two clusters joined by a sparse arc. So Kruskal
+    runs again with the nearest city in every octant of each city added
+    (octant_neighbors()); those edges contain an MST, and none of its edges
+    is longer than the longest edge of the first tree, which bounds the
+    octant search.
+    """
+    N = len(cities)
+    if N < 2:
+        return [[] for _ in range(N)]
+    if neighbors is None:
+        neighbors = nearest_neighbors(cities, NUM_NEIGHBORS)
+    coords = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+    tree = _spanning_tree(cities, coords, *candidate_edges(cities, neighbors))
+    longest = max(float(np.hypot(*(coords[u] - coords[v])))
+                  for u in range(N) for v in tree[u])
+    octants = octant_neighbors(cities, longest)
+    us, vs = candidate_edges(cities, [list(nb) + oc for nb, oc in
+                                      zip(neighbors, octants)])
+    return _spanning_tree(cities, coords, us, vs)
+
+
+def _spanning_tree(cities, coords, us, vs):
+    """Return the adjacency lists of a spanning tree from candidate edges.
+
+    Kruskal runs over the edges us[i]-vs[i] (sorted by length). If they
+    leave the graph disconnected (well separated clusters), Boruvka steps
+    add the shortest edge out of every component but the largest until it
+    is connected.
+    """
+    N = len(cities)
+    adj = [[] for _ in range(N)]
+    uf = unionFind(N)
+    while True:
+        for u, v, merged in zip(us, vs, uf.unite_many(us, vs)):
+            if merged:
+                adj[u].append(v)
+                adj[v].append(u)
+        if uf.components == 1:
+            break
+        labels = np.array([uf.root(i) for i in range(N)])
+        roots, sizes = np.unique(labels, return_counts=True)
+        largest = roots[sizes.argmax()]
+        joins = sorted(_nearest_outside(coords, labels, root)
+                       for root in roots if root != largest)
+        us = [u for _, u, _ in joins]
+        vs = [v for _, _, v in joins]
+    return adj
+
+
+def _nearest_outside(coords, labels, root):
+    """Return (distance, u, v) of the shortest edge leaving component |root|."""
+    inside = np.flatnonzero(labels == root)
+    outside = np.flatnonzero(labels != root)
+    best = (np.inf, -1, -1)
+    block = max(1, BLOCK_ENTRIES // len(outside))
+    for start in range(0, len(inside), block):
+        rows = inside[start:start + block]
+        d = np.hypot(coords[rows, 0, None] - coords[outside, 0],
+                     coords[rows, 1, None] - coords[outside, 1])
+        r, c = np.unravel_index(d.argmin(), d.shape)
+        if d[r, c] < best[0]:
+            best = (float(d[r, c]), int(rows[r]), int(outside[c]))
+    return best
+
+
+def nearest_neighbor_tour(cities, start=0):
+    """Return the nearest-neighbor tour from |start|.
+
+    The unvisited cities live in a SpatialGrid and are removed as they are
+    visited, so each step searches a few cells around the current city
+    instead of every unvisited city. Ties go to the lower index.
+    """
+    N = len(cities)
+    if N == 0:
+        return []
+    grid = SpatialGrid(cities)
+    xs, ys = grid.xs, grid.ys
+    grid.remove(start)
+    tour = [start]
+    current = start
+    for _ in range(N - 1):
+        current = grid.nearest(xs[current], ys[current])
+        grid.remove(current)
+        tour.append(current)
+    return tour
+
+
+def tour_from_cycle(adj, start=0):
+    """Walk a Hamiltonian cycle given as adjacency lists into a tour."""
+    N = len(adj)
+    tour = [start]
+    previous, current = -1, start
+    while len(tour) < N:
+        next_city = adj[current][0]
+        if next_city == previous:
+            next_city = adj[current][1]
+        tour.append(next_city)
+        previous, current = current, next_city
+    return tour
+
+
+def double_tree_tour(cities, neighbors=None):
+    """Return the preorder walk of the MST (at most twice the optimum)."""
+    N = len(cities)
+    if N == 0:
+        return []
+    mst = minimum_spanning_tree(cities, neighbors)
+    visited = [False] * N
+    tour = []
+    stack = [0]
+    while stack:
+        city = stack.pop()
+        if visited[city]:
+            continue
+        visited[city] = True
+        tour.append(city)
+        stack.extend(reversed(mst[city]))
+    return tour
+
+
+def _greedy_matching(cities, subset):
+    """Pair up the cities of |subset| greedily by candidate edge length."""
+    matched = {}
+    unmatched = list(subset)
+    while unmatched:
+        for u, v in zip(*_subset_edges(cities, unmatched)):
+            if u not in matched and v not in matched:
+                matched[u] = v
+                matched[v] = u
+        unmatched = [i for i in unmatched if i not in matched]
+    return [(u, v) for u, v in matched.items() if u < v]
+
+
+def christofides_tour(cities, neighbors=None):
+    """Return a Christofides-style tour.
+
+    The odd-degree vertices of the MST are paired up greedily (instead of by
+    a minimum-weight perfect matching), an Euler circuit of the MST plus the
+    matching is found, and repeated cities are skipped.
+    """
+    N = len(cities)
+    if N < 3:
+        return list(range(N))
+    mst = minimum_spanning_tree(cities, neighbors)
+    odd = [i for i in range(N) if len(mst[i]) % 2]
+    edges = [(u, v) for u in range(N) for v in mst[u] if u < v]
+    edges += _greedy_matching(cities, odd)
+
+    # Hierholzer's algorithm on the multigraph.
+    incident = [[] for _ in range(N)]
+    for e, (u, v) in enumerate(edges):
+        incident[u].append(e)
+        incident[v].append(e)
+    used = [False] * len(edges)
+    pointer = [0] * N
+    stack = [0]
+    visited = [False] * N
+    tour = []
+    while stack:
+        u = stack[-1]
+        while pointer[u] < len(incident[u]) and used[incident[u][pointer[u]]]:
+            pointer[u] += 1
+        if pointer[u] == len(incident[u]):
+            stack.pop()
+            if not visited[u]:
+                visited[u] = True
+                tour.append(u)
+            continue
+        e = incident[u][pointer[u]]
+        used[e] = True
+        a, b = edges[e]
+        stack.append(b if a == u else a)
+    return tour
@@ -0,0 +1,145 @@
+import collections
+
+import numpy as np
+
+# Above this many cities distance_matrix() returns a DistanceOracle instead of
+# a dense matrix (10k cities is 800 MB as float64, 400 MB as float32).
+MAX_DENSE_CITIES = 10_000
+
+# Memory a DistanceOracle may spend on cached rows.
+ORACLE_CACHE_BYTES = 256 << 20
+
+# distance_matrix() fills the matrix in blocks of about this many entries, so
+# the temporaries stay small and in cache.
+BLOCK_ENTRIES = 1 << 19
+
+
+def coordinates(cities):
+    """Return |cities| as an (N, 2) float64 array."""
+    return np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+
+
+class DistanceOracle:
+    """Distances computed on demand from the city coordinates.
+
+    Supports the same indexing as a dense matrix: oracle[i] is the row of
+    distances from city i, oracle[i][j] and oracle[i, j] the distance between
+    i and j, and oracle[rows, cols] a vectorized gather for index arrays.
+
+    Rows are kept in an LRU cache holding at most |cache_bytes| of rows, so
+    the rows a solver keeps coming back to are computed once while memory
+    stays bounded however large N is. Single entries are read from a cached
+    row when there is one and computed directly otherwise, so they do not
+    push hot rows out.
+    """
+
+    def __init__(self, cities, dtype=np.float64, cache_bytes=None):
+        if cache_bytes is None:
+            cache_bytes = ORACLE_CACHE_BYTES
+        coords = coordinates(cities)
+        self.x = coords[:, 0].copy()
+        self.y = coords[:, 1].copy()
+        self.dtype = np.dtype(dtype)
+        self.shape = (len(coords), len(coords))
+        row_bytes = max(1, len(coords) * self.dtype.itemsize)
+        self.max_rows = max(1, cache_bytes // row_bytes)
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _compute(self, indices):
+        """Compute the rows of |indices| as one (len(indices), N) block."""
+        dx = self.x[indices, None] - self.x[None, :]
+        dy = self.y[indices, None] - self.y[None, :]
+        dx *= dx
+        dy *= dy
+        dx += dy
+        return np.sqrt(dx).astype(self.dtype, copy=False)
+
+    def _store(self, i, row):
+        self.cache[i] = row
+        if len(self.cache) > self.max_rows:
+            self.cache.popitem(last=False)
+
+    def row(self, i):
+        """Return the distances from city |i| to every city."""
+        i = int(i)
+        row = self.cache.get(i)
+        if row is not None:
+            self.hits += 1
+            self.cache.move_to_end(i)
+            return row
+        self.misses += 1
+        row = self._compute(np.array([i]))[0]
+        self._store(i, row)
+        return row
+
+    def rows(self, indices):
+        """Return the rows of |indices|, computing the missing ones together.
+
+        Solvers that know which rows they are about to scan (a batch of
+        cities, a cluster) can fetch them with one vectorized computation.
+        """
+        indices = [int(i) for i in indices]
+        missing = [i for i in dict.fromkeys(indices) if i not in self.cache]
+        self.misses += len(missing)
+        self.hits += len(indices) - len(missing)
+        if missing:
+            block = self._compute(np.array(missing))
+            for i, row in zip(missing, block):
+                self._store(i, row)
+        result = []
+        for i in indices:
+            row = self.cache.get(i)
+            if row is None:
+                # Evicted again by a batch larger than the cache.
+                row = self._compute(np.array([i]))[0]
+            else:
+                self.cache.move_to_end(i)
+            result.append(row)
+        return np.array(result, dtype=self.dtype).reshape(len(indices), -1)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            if np.ndim(i) == 0 and np.ndim(j) == 0:
+                row = self.cache.get(int(i))
+                if row is not None:
+                    return row[j]
+            d = np.hypot(self.x[i] - self.x[j], self.y[i] - self.y[j])
+            if np.ndim(d):
+                return d.astype(self.dtype, copy=False)
+            return self.dtype.type(d)
+        return self.row(key)
+
+
+def distance_matrix(cities, dtype=np.float64, max_dense=None):
+    """Return the pairwise distance matrix of |cities|.
+
+    The matrix is built with broadcast NumPy operations, one block of rows at
+    a time. |dtype| may be np.float32 to halve the memory. If there are more
+    than |max_dense| cities (default MAX_DENSE_CITIES), a DistanceOracle with
+    the same indexing and a bounded row cache is returned instead of a dense
+    matrix.
+    """
+    if max_dense is None:
+        max_dense = MAX_DENSE_CITIES
+    coords = coordinates(cities)
+    N = len(coords)
+    if N > max_dense:
+        return DistanceOracle(coords, dtype)
+    x, y = coords[:, 0], coords[:, 1]
+    dist = np.empty((N, N), dtype=dtype)
+    block = max(1, BLOCK_ENTRIES // max(N, 1))
+    for start in range(0, N, block):
+        stop = min(start + block, N)
+        dx = x[start:stop, None] - x[None, :]
+        dy = y[start:stop, None] - y[None, :]
+        dx *= dx
+        dy *= dy
+        dx += dy
+        np.sqrt(dx, out=dist[start:stop])
+    return dist
@@ -0,0 +1,69 @@
+import numpy as np
+
+from distance import coordinates
+
+# Bits per axis of the Hilbert curve grid (a 65536 x 65536 grid).
+ORDER = 16
+
+
+def hilbert_keys(cities, order=ORDER):
+    """Return the position of every city along a Hilbert curve.
+
+    The bounding box is mapped onto a 2^|order| x 2^|order| grid and the
+    cell of each city is converted to its distance along the curve, for all
+    cities at once, one bit level at a time.
+    """
+    coords = coordinates(cities)
+    n = 1 << order
+    if len(coords) == 0:
+        return np.empty(0, dtype=np.int64)
+    low = coords.min(axis=0)
+    span = max(float((coords.max(axis=0) - low).max()), 1e-9)
+    cells = ((coords - low) * ((n - 1) / span)).astype(np.int64)
+    x, y = cells[:, 0], cells[:, 1]
+    keys = np.zeros(len(coords), dtype=np.int64)
+    s = n // 2
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        keys += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the sub-curve starts where the curve enters.
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s //= 2
+    return keys
+
+
+def hilbert_tour(cities):
+    """Return the cities in Hilbert curve order, an O(N log N) tour.
+
+    Neighboring cities on the curve are close in the plane, so the tour is
+    a usable start for local search (about 40% above optimal on uniform
+    inputs, against 25% for nearest neighbor) at a fraction of the cost.
+    """
+    return np.argsort(hilbert_keys(cities), kind='stable').tolist()
+
+
+def renumber(cities):
+    """Renumber the cities in Hilbert curve order.
+
+    return: (renumbered, original) where renumbered[i] is the city
+    cities[original[i]]. Cities close in the plane get close indices, so the
+    arrays and matrix rows a solver reads for nearby cities are close in
+    memory too.
+    """
+    original = hilbert_tour(cities)
+    return [cities[i] for i in original], original
+
+
+def solve_renumbered(solve, cities, *args, **kwargs):
+    """Run |solve| on the renumbered cities; return the tour in input indices.
+
+    Works with any solver's solve(cities, ...), e.g.
+    solve_renumbered(solver_lk.solve, cities).
+    """
+    renumbered, original = renumber(cities)
+    tour = solve(renumbered, *args, **kwargs)
+    return [original[i] for i in tour]
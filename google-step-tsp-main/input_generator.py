@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
 
+import argparse
 import random
 
+import numpy as np
+
 CHALLENGE_SIZES = (5, 8, 16, 64, 128, 512, 2048)
 
+DISTRIBUTIONS = ('uniform', 'clustered', 'grid', 'gaussian_mixture')
+
+# Cities generated and written per block.
+CHUNK_SIZE = 1 << 20
+
+# Average number of cities per cluster of the 'clustered' distribution.
+CITIES_PER_CLUSTER = 1000
+
 
 def generate_cities(n, max_x=1600.0, max_y=900.0, seed=1):
     random.seed(seed)
@@ -11,6 +22,81 @@ def generate_cities(n, max_x=1600.0, max_y=900.0, seed=1):
         yield random.uniform(0, max_x), random.uniform(0, max_y)
 
 
+def generate_chunks(n, distribution='uniform', max_x=1600.0, max_y=900.0,
+                    seed=1, chunk_size=CHUNK_SIZE):
+    """Yield (k, 2) float64 arrays holding |n| cities in total.
+
+    All cities are inside [0, max_x] x [0, max_y] and depend only on |n|,
+    |distribution| and |seed|, not on |chunk_size|:
+    - uniform: uniformly random.
+    - clustered: round clusters of about CITIES_PER_CLUSTER cities with
+      uniformly random centers, like towns.
+    - grid: a jittered regular grid with about max_x / max_y aspect ratio.
+    - gaussian_mixture: a few large elongated Gaussian blobs of random size
+      and weight, like regions of a country.
+    Only one chunk exists at a time, so |n| can be far above what fits in
+    memory as Python tuples.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f'unknown distribution: {distribution}')
+    rng = np.random.default_rng(seed)
+    low, high = np.zeros(2), np.array([max_x, max_y])
+
+    if distribution == 'clustered':
+        k = max(1, n // CITIES_PER_CLUSTER)
+        means = rng.uniform(low, high, size=(k, 2))
+        scales = np.full((k, 2), min(max_x, max_y) / (4 * np.sqrt(k)))
+        weights = np.full(k, 1 / k)
+    elif distribution == 'gaussian_mixture':
+        k = int(rng.integers(3, 9))
+        means = rng.uniform(low + 0.1 * high, 0.9 * high, size=(k, 2))
+        scales = rng.uniform(0.02, 0.15, size=(k, 2)) * high
+        weights = rng.dirichlet(np.ones(k))
+    elif distribution == 'grid':
+        columns = max(1, int(np.ceil(np.sqrt(n * max_x / max(max_y, 1e-9)))))
+        rows = max(1, -(-n // columns))
+        step = np.array([max_x / columns, max_y / rows])
+
+    # Labels and offsets come from generators of their own, so that how the
+    # draws are split into chunks does not change them.
+    label_rng, noise_rng = rng.spawn(2)
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        if distribution == 'uniform':
+            chunk = rng.uniform(low, high, size=(size, 2))
+        elif distribution == 'grid':
+            index = np.arange(start, start + size)
+            cells = np.column_stack((index % columns, index // columns))
+            chunk = (cells + rng.uniform(0.25, 0.75, size=(size, 2))) * step
+        else:
+            labels = label_rng.choice(len(weights), size=size, p=weights)
+            chunk = noise_rng.normal(means[labels], scales[labels])
+        yield np.clip(chunk, low, high)
+
+
+def write_cities(filename, n, chunks):
+    """Write the |n| cities of |chunks| to |filename|.
+
+    A .npy filename gets the binary array, written chunk by chunk through a
+    memory map; anything else gets CSV in the read_input() format, one
+    formatted block per chunk.
+    """
+    if filename.endswith('.npy'):
+        out = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float64,
+                                        shape=(n, 2))
+        start = 0
+        for chunk in chunks:
+            out[start:start + len(chunk)] = chunk
+            start += len(chunk)
+        out.flush()
+        return
+    with open(filename, 'w') as f:
+        f.write('x,y\n')
+        for chunk in chunks:
+            f.write(''.join(map('{},{}\n'.format, chunk[:, 0].tolist(),
+                                chunk[:, 1].tolist())))
+
+
 def main():
     for i, n in enumerate(CHALLENGE_SIZES):
         with open(f'input_{i}.csv', 'w') as f:
@@ -20,4 +106,24 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(
+        description='Without arguments, regenerate input_0..6.csv.')
+    parser.add_argument('-n', type=int, help='number of cities')
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS,
+                        default='uniform')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-x', type=float, default=1600.0)
+    parser.add_argument('--max-y', type=float, default=900.0)
+    parser.add_argument('-o', '--output',
+                        help='.csv or .npy file (default: '
+                        'DISTRIBUTION_N_seedSEED.csv, which never replaces '
+                        'a challenge input)')
+    args = parser.parse_args()
+    if args.n is None:
+        main()
+    else:
+        output = (args.output
+                  or f'{args.distribution}_{args.n}_seed{args.seed}.csv')
+        write_cities(output, args.n,
+                     generate_chunks(args.n, args.distribution, args.max_x,
+                                     args.max_y, args.seed))
@@ -0,0 +1,348 @@
+import collections
+import math
+import random
+import time
+
+from neighbors import nearest_neighbors
+from tour import make_tour
+
+# Moves must gain at least this much, so rounding noise cannot make us cycle.
+EPSILON = 1e-9
+
+# Or-opt moves segments of up to this many cities.
+OR_OPT_MAX_SEGMENT = 3
+
+# Iterated local search swaps two adjacent segments of up to this many cities.
+KICK_MAX_SEGMENT = 50
+
+# Progress callbacks get the best tour at most this often, in seconds, since
+# each report copies the tour.
+REPORT_INTERVAL = 1.0
+
+
+def tour_length(tour, cities):
+    """Return the length of the closed tour."""
+    return sum(math.dist(cities[tour[i - 1]], cities[tour[i]])
+               for i in range(len(tour)))
+
+
+class TourCost:
+    """The length of a tour, kept up to date from the gain of each move.
+
+    Every move computes its gain before it is applied anyway, so tracking the
+    length costs O(1) per move instead of a full rescan of the tour.
+    """
+
+    def __init__(self, value):
+        self.value = value
+        self.moves = 0
+
+    def apply(self, gain):
+        self.value -= gain
+        self.moves += 1
+
+
+class LocalSearch:
+    """Neighbor-list local search over a single tour.
+
+    Moves only add edges from a city to one of its nearest neighbors. A city
+    whose neighborhood gave no improvement is not looked at again until one of
+    its tour edges changes (don't-look bits). |self.cost| follows the tour
+    length as moves are applied, so callers can chain several searches without
+    rescanning the tour. Moves run on a tour.make_tour structure and are
+    written back to the list when optimize() finishes.
+
+    |tour|: list of city indices, modified in place.
+    |cities|: list of (x, y), as returned by read_input.
+    |neighbors|: optional neighbor lists from neighbors.nearest_neighbors.
+    |active|: optional cities to start with cleared don't-look bits, for
+    repairing part of an otherwise optimized tour; all cities by default.
+    """
+
+    def __init__(self, tour, cities, neighbors=None, active=None):
+        self.order = tour
+        self.tour = make_tour(tour)
+        self.next = self.tour.next
+        self.prev = self.tour.prev
+        self.N = len(tour)
+        if neighbors is None:
+            neighbors = nearest_neighbors(cities)
+        self.neighbors = neighbors
+        self.xs = [float(x) for x, _ in cities]
+        self.ys = [float(y) for _, y in cities]
+        self.cost = TourCost(tour_length(tour, cities))
+        if active is None:
+            active = tour
+        self.queue = collections.deque(active)
+        self.queued = [False] * len(cities)
+        for city in self.queue:
+            self.queued[city] = True
+        # While not None, every exchange is recorded here so it can be undone.
+        self.journal = None
+
+    def d(self, a, b):
+        xs, ys = self.xs, self.ys
+        return math.sqrt((xs[a] - xs[b]) ** 2 + (ys[a] - ys[b]) ** 2)
+
+    def wake(self, *cities):
+        """Clear the don't-look bits of |cities|."""
+        for city in cities:
+            if not self.queued[city]:
+                self.queued[city] = True
+                self.queue.append(city)
+
+    def exchange(self, a, b, c, d):
+        """Replace edges (a, b), (c, d) by (a, c), (b, d).
+
+        b must follow a and d must follow c in the same direction of travel.
+        exchange(a, c, b, d) undoes it.
+        """
+        if self.journal is not None:
+            self.journal.append((a, b, c, d))
+        if self.tour.next(a) == b:
+            self.tour.reverse(b, c)
+        else:
+            self.tour.reverse(c, b)
+
+    def try_two_opt(self, a):
+        """Apply the first improving 2-opt move adding an edge at |a|."""
+        d = self.d
+        a_next, a_prev = self.next(a), self.prev(a)
+        d_next, d_prev = d(a, a_next), d(a, a_prev)
+        for c in self.neighbors[a]:
+            d_ac = d(a, c)
+            # Neighbors are sorted, so no later c can give a gain either.
+            if d_ac >= d_next and d_ac >= d_prev:
+                break
+            for a_succ, d_succ, c_succ in ((a_next, d_next, self.next(c)),
+                                           (a_prev, d_prev, self.prev(c))):
+                if d_ac >= d_succ or c == a_succ or c_succ == a:
+                    continue
+                gain = d_succ + d(c, c_succ) - d_ac - d(a_succ, c_succ)
+                if gain > EPSILON:
+                    self.exchange(a, a_succ, c, c_succ)
+                    self.cost.apply(gain)
+                    self.wake(a, a_succ, c, c_succ)
+                    return True
+        return False
+
+    def try_or_opt(self, a, max_segment=OR_OPT_MAX_SEGMENT):
+        """Apply the first improving Or-opt move of a segment ending at |a|.
+
+        Segments of 1..|max_segment| cities are cut out and reinserted next to
+        a neighbor of one of their ends, in either orientation. Inserting the
+        segment reversed is the segment-insertion form of 3-opt.
+        """
+        if self.N < max_segment + 4:
+            return False
+        d = self.d
+        for succ, pred in ((self.next, self.prev), (self.prev, self.next)):
+            s1 = s2 = a
+            segment = {a}
+            for _ in range(max_segment):
+                p, n = pred(s1), succ(s2)
+                removed = d(p, s1) + d(s2, n) - d(p, n)
+                if removed > EPSILON:
+                    for x, y in ((s1, s2), (s2, s1)):
+                        for c in self.neighbors[x]:
+                            d_cx = d(c, x)
+                            if d_cx >= removed:
+                                break
+                            if c in segment:
+                                continue
+                            for e in (self.next(c), self.prev(c)):
+                                if e in segment:
+                                    continue
+                                gain = removed - d_cx - d(y, e) + d(c, e)
+                                if gain > EPSILON:
+                                    if succ == self.next:
+                                        self.move_segment(s1, s2, c, e, x)
+                                    else:
+                                        self.move_segment(s2, s1, c, e, x)
+                                    self.cost.apply(gain)
+                                    self.wake(p, n, s1, s2, c, e)
+                                    return True
+                s2 = n
+                segment.add(n)
+        return False
+
+    def move_segment(self, first, last, c, e, x):
+        """Move the path first..last between adjacent cities c and e.
+
+        |first| must come before |last| going forward along the tour. |x| is
+        the end of the segment that ends up next to c.
+        """
+        before, after = self.prev(first), self.next(last)
+        if self.next(c) == e:
+            u, v = c, e
+        else:
+            u, v = e, c
+        # Two exchanges leave the segment reversed between u and v:
+        # before first..last after ... u v  ->  before after ... u last..first v
+        if u == after:
+            self.exchange(before, first, u, v)
+        elif v == before:
+            self.exchange(u, v, last, after)
+        else:
+            self.exchange(before, first, u, v)
+            self.exchange(before, u, after, last)
+        if first != last and (x == last) != (c == u):
+            self.exchange(u, last, first, v)
+
+    def optimize(self, moves=None, deadline=None):
+        """Apply improving moves until every don't-look bit is set.
+
+        |moves|: methods tried on each city in order; defaults to
+        default_moves(), 2-opt then Or-opt.
+        |deadline|: optional time.time() value after which the search stops
+        early, leaving the tour as improved so far.
+        """
+        self._descend(moves, deadline)
+        self.order[:] = self.tour.to_list()
+        return self.order
+
+    def default_moves(self):
+        return (self.try_two_opt, self.try_or_opt)
+
+    def _descend(self, moves, deadline):
+        if moves is None:
+            moves = self.default_moves()
+        queue, queued = self.queue, self.queued
+        if self.N < 5:
+            queue.clear()
+        steps = 0
+        while queue:
+            steps += 1
+            if deadline is not None and steps % 64 == 0 and time.time() > deadline:
+                break
+            a = queue.popleft()
+            queued[a] = False
+            while any(move(a) for move in moves):
+                pass
+
+    def kick(self, rng=random, max_segment=KICK_MAX_SEGMENT):
+        """Apply a random double-bridge kick to the tour.
+
+        Two adjacent segments B and C of up to |max_segment| cities swap
+        places (A B C D becomes A C B D). Only the six cities at the three
+        changed edges get their don't-look bits cleared, so the following
+        descent repairs the kick locally instead of rescanning the tour.
+        """
+        longest = min(max_segment, (self.N - 2) // 2)
+        b1 = rng.randrange(self.N)
+        b2 = b1
+        for _ in range(rng.randrange(longest)):
+            b2 = self.next(b2)
+        c1 = c2 = self.next(b2)
+        for _ in range(rng.randrange(longest)):
+            c2 = self.next(c2)
+        p, n = self.prev(b1), self.next(c2)
+        d = self.d
+        gain = d(p, b1) + d(b2, c1) + d(c2, n) - d(p, c1) - d(c2, b1) - d(b2, n)
+        self.move_segment(b1, b2, c2, n, b1)
+        self.cost.apply(gain)
+        self.wake(p, b1, b2, c1, c2, n)
+
+    def iterate(self, moves=None, deadline=None, iterations=None, rng=None,
+                callback=None, stagnation=None):
+        """Iterated local search: kick, descend, keep the result if no worse.
+
+        The tour is first brought to a local optimum. Then each iteration
+        applies kick() and the local search; if the tour got longer than the
+        best so far, the exchanges since the kick are undone from a journal,
+        which costs as much as the moves themselves rather than a copy of
+        the tour. Runs until |deadline|, |iterations| kicks or |stagnation|
+        kicks in a row without a shorter tour, and forever if none is given.
+
+        |callback|: optional callback(tour, length), called with the first
+        local optimum, then with new best tours at most every
+        REPORT_INTERVAL seconds, and with the final tour if it is better than
+        the last one reported.
+        """
+        rng = rng or random.Random(0)
+        self._descend(moves, deadline)
+        reported = math.inf
+        last_report = time.time()
+        if callback is not None:
+            reported = self.cost.value
+            callback(self.tour.to_list(), reported)
+        if self.N >= 8:
+            count = 0
+            stagnant = 0
+            while iterations is None or count < iterations:
+                if deadline is not None and time.time() > deadline:
+                    break
+                if stagnation is not None and stagnant >= stagnation:
+                    break
+                count += 1
+                stagnant += 1
+                best_value = self.cost.value
+                self.journal = []
+                self.kick(rng)
+                self._descend(moves, deadline)
+                journal, self.journal = self.journal, None
+                if self.cost.value > best_value + EPSILON:
+                    for a, b, c, d in reversed(journal):
+                        self.exchange(a, c, b, d)
+                    self.cost.value = best_value
+                    while self.queue:
+                        self.queued[self.queue.pop()] = False
+                    continue
+                if self.cost.value < best_value - EPSILON:
+                    stagnant = 0
+                if (callback is not None
+                      and self.cost.value < reported - EPSILON
+                      and time.time() - last_report >= REPORT_INTERVAL):
+                    reported = self.cost.value
+                    last_report = time.time()
+                    callback(self.tour.to_list(), reported)
+        self.order[:] = self.tour.to_list()
+        if callback is not None and self.cost.value < reported - EPSILON:
+            callback(list(self.order), self.cost.value)
+        return self.order
+
+
+def double_bridge(tour, rng=random):
+    """Return |tour| cut into A B C D at random and rejoined as A C B D.
+
+    The kick changes four edges in a way 2-opt and Or-opt cannot undo in one
+    move, so it moves a converged tour out of its local optimum.
+    """
+    if len(tour) < 8:
+        return list(tour)
+    i, j, k = sorted(rng.sample(range(1, len(tour)), 3))
+    return tour[:i] + tour[j:k] + tour[i:j] + tour[k:]
+
+
+def two_opt(tour, cities, neighbors=None):
+    """Improve |tour| in place with neighbor-list 2-opt; return it."""
+    search = LocalSearch(tour, cities, neighbors)
+    return search.optimize((search.try_two_opt,))
+
+
+def or_opt(tour, cities, neighbors=None):
+    """Improve |tour| in place with neighbor-list Or-opt; return it."""
+    search = LocalSearch(tour, cities, neighbors)
+    return search.optimize((search.try_or_opt,))
+
+
+def iterated_local_search(tour, cities, neighbors=None, time_limit=None,
+                          iterations=None, seed=0):
+    """Improve |tour| in place with 2-opt and Or-opt plus double-bridge kicks.
+
+    return: the improved tour and its length.
+    """
+    deadline = None if time_limit is None else time.time() + time_limit
+    search = LocalSearch(tour, cities, neighbors)
+    search.iterate(deadline=deadline, iterations=iterations,
+                   rng=random.Random(seed))
+    return tour, search.cost.value
+
+
+def improve(tour, cities, neighbors=None):
+    """Improve |tour| in place with 2-opt and Or-opt until neither helps.
+
+    return: the improved tour and its length.
+    """
+    search = LocalSearch(tour, cities, neighbors)
+    return search.optimize(), search.cost.value
@@ -0,0 +1,176 @@
+import math
+
+# How many candidate neighbors each city keeps by default.
+DEFAULT_K = 8
+
+
+class SpatialGrid:
+    """A uniform grid over the bounding box of the cities.
+
+    Each cell holds the indices of the cities inside it. The cell size is
+    chosen so that a cell holds about two cities on average, which keeps
+    nearest-neighbor queries close to O(1) for reasonably spread inputs.
+
+    Cities can be removed. Once half of them are gone the grid is rebuilt
+    over the remaining ones, so queries do not slow down scanning empty cells.
+    """
+
+    def __init__(self, cities, cities_per_cell=2.0):
+        self.xs = [float(x) for x, _ in cities]
+        self.ys = [float(y) for _, y in cities]
+        self.cities_per_cell = cities_per_cell
+        self._build(range(len(cities)))
+
+    def _build(self, indices):
+        xs = [self.xs[i] for i in indices]
+        ys = [self.ys[i] for i in indices]
+        N = len(xs)
+        self.count = self.built_count = N
+        self.min_x = min(xs) if N else 0.0
+        self.min_y = min(ys) if N else 0.0
+        width = (max(xs) - self.min_x) if N else 0.0
+        height = (max(ys) - self.min_y) if N else 0.0
+        area = max(width, 1e-9) * max(height, 1e-9)
+        # On a thin strip or a line the area says nothing, so the cells are
+        # also sized to split the longer side in about N / cities_per_cell.
+        # Either way there are O(N) cells.
+        self.cell_size = max(
+            math.sqrt(area * self.cities_per_cell / max(N, 1)),
+            max(width, height) * self.cities_per_cell / max(N, 1), 1e-9)
+        self.nx = int(width / self.cell_size) + 1
+        self.ny = int(height / self.cell_size) + 1
+        self.cells = [[] for _ in range(self.nx * self.ny)]
+        for i in indices:
+            self.cells[self.cell_of(self.xs[i], self.ys[i])].append(i)
+
+    def remove(self, i):
+        """Remove city |i| from the grid."""
+        self.cells[self.cell_of(self.xs[i], self.ys[i])].remove(i)
+        self.count -= 1
+        if 0 < self.count < self.built_count // 2:
+            self._build([j for cell in self.cells for j in cell])
+
+    def nearest(self, x, y):
+        """Return the remaining city closest to (x, y), or None if empty."""
+        if self.count == 0:
+            return None
+        cx, cy = self.cell_coords(x, y)
+        xs, ys = self.xs, self.ys
+        max_r = max(self.nx, self.ny)
+        best = None
+        r = 0
+        while r <= max_r:
+            for cell in self.ring(cx, cy, r):
+                for j in cell:
+                    d = ((xs[j] - x) ** 2 + (ys[j] - y) ** 2, j)
+                    if best is None or d < best:
+                        best = d
+            # Anything outside the rings searched so far is r * cell_size away.
+            if best is not None and best[0] <= (r * self.cell_size) ** 2:
+                break
+            r += 1
+        return best[1]
+
+    def cell_coords(self, x, y):
+        cx = min(int((x - self.min_x) / self.cell_size), self.nx - 1)
+        cy = min(int((y - self.min_y) / self.cell_size), self.ny - 1)
+        return max(cx, 0), max(cy, 0)
+
+    def cell_of(self, x, y):
+        cx, cy = self.cell_coords(x, y)
+        return cy * self.nx + cx
+
+    def ring(self, cx, cy, r):
+        """Yield the non-empty cells at Chebyshev distance |r| from (cx, cy)."""
+        x_lo, x_hi = cx - r, cx + r
+        y_lo, y_hi = cy - r, cy + r
+        for y in range(max(y_lo, 0), min(y_hi, self.ny - 1) + 1):
+            row = y * self.nx
+            if y == y_lo or y == y_hi:
+                xs = range(max(x_lo, 0), min(x_hi, self.nx - 1) + 1)
+            else:
+                xs = [x for x in (x_lo, x_hi) if 0 <= x < self.nx]
+            for x in xs:
+                cell = self.cells[row + x]
+                if cell:
+                    yield cell
+
+    def k_nearest(self, i, k):
+        """Return the |k| nearest cities to city |i|, closest first."""
+        x, y = self.xs[i], self.ys[i]
+        cx, cy = self.cell_coords(x, y)
+        xs, ys = self.xs, self.ys
+        max_r = max(self.nx, self.ny)
+        found = []
+        r = 0
+        while r <= max_r:
+            for cell in self.ring(cx, cy, r):
+                for j in cell:
+                    if j != i:
+                        found.append(((xs[j] - x) ** 2 + (ys[j] - y) ** 2, j))
+            # Every city outside the rings searched so far is at least
+            # r * cell_size away, so the k best are final once they are closer.
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                if found[-1][0] <= (r * self.cell_size) ** 2:
+                    break
+            r += 1
+        found.sort()
+        return [j for _, j in found[:k]]
+
+    def octant_nearest(self, i, max_distance=math.inf):
+        """Return the nearest city to city |i| in each octant around it.
+
+        The octants are the eight 45 degree sectors split by the axes and the
+        diagonals. Octants without a city within |max_distance| are left out.
+        """
+        x, y = self.xs[i], self.ys[i]
+        cx, cy = self.cell_coords(x, y)
+        xs, ys = self.xs, self.ys
+        max_r = max(self.nx, self.ny)
+        if max_distance < math.inf:
+            # Cities in ring r are at least (r - 1) * cell_size away.
+            max_r = min(max_r, int(max_distance / self.cell_size) + 1)
+        limit = max_distance ** 2
+        best = [None] * 8
+        r = 0
+        while r <= max_r:
+            for cell in self.ring(cx, cy, r):
+                for j in cell:
+                    if j == i:
+                        continue
+                    dx, dy = xs[j] - x, ys[j] - y
+                    d = (dx * dx + dy * dy, j)
+                    octant = 4 * (dx < 0) + 2 * (dy < 0) + (abs(dx) < abs(dy))
+                    if d[0] <= limit and (best[octant] is None
+                                          or d < best[octant]):
+                        best[octant] = d
+            bound = (r * self.cell_size) ** 2
+            if all(b is not None and b[0] <= bound for b in best):
+                break
+            r += 1
+        return [b[1] for b in best if b is not None]
+
+
+def nearest_neighbors(cities, k=DEFAULT_K):
+    """Return, for every city, its |k| nearest other cities (closest first)."""
+    k = min(k, len(cities) - 1)
+    if k <= 0:
+        return [[] for _ in cities]
+    grid = SpatialGrid(cities)
+    return [grid.k_nearest(i, k) for i in range(len(cities))]
+
+
+def octant_neighbors(cities, max_distance=math.inf):
+    """Return, for every city, its nearest city in each octant around it.
+
+    Any two cities in one octant of a third are at most 45 degrees apart as
+    seen from it, so a Euclidean minimum spanning tree only uses these edges
+    (the Yao graph). |max_distance| bounds the search; no MST edge is longer
+    than the longest edge of any spanning tree.
+    """
+    if len(cities) < 2:
+        return [[] for _ in cities]
+    grid = SpatialGrid(cities)
+    return [grid.octant_nearest(i, max_distance) for i in range(len(cities))]
@@ -1,32 +1,107 @@
-import math
+import concurrent.futures
+import itertools
+import os
+import sys
 
-from common import read_input
+import numpy as np
+
+from common import load_cities
 
 CHALLENGES = 8
 
+OUTPUT_PREFIXES = ('sample/random', 'sample/greedy', 'sample/mst')
+
+
+def read_tour(filename, N):
+    """Return the first |N| city indices of the tour file |filename|.
+
+    Raises ValueError if the file is malformed: no 'index' header, a line
+    that is not an integer (blank lines included) or fewer than |N| lines.
+    """
+    with open(filename) as f:
+        if f.readline().strip() != 'index':
+            raise ValueError("the first line is not 'index'")
+        lines = list(itertools.islice(f, N))
+    tour = np.zeros(len(lines), dtype=np.int64)
+    for row, line in enumerate(lines):
+        try:
+            tour[row] = int(line)
+        except (ValueError, OverflowError):
+            raise ValueError(
+                f'line {row + 2} is not a city index: {line!r}') from None
+    if len(tour) < N:
+        raise ValueError(f'{len(tour)} cities instead of {N}')
+    return tour
+
+
+def is_permutation(tour, N):
+    """Return whether |tour| visits each of the |N| cities exactly once."""
+    if len(tour) != N or (N and (tour.min() < 0 or tour.max() >= N)):
+        return False
+    return bool((np.bincount(tour, minlength=N) == 1).all())
+
+
+def path_length(tour, cities):
+    """Return the length of the closed |tour| with one vectorized gather."""
+    steps = cities[np.roll(tour, -1)] - cities[tour]
+    return float(np.hypot(steps[:, 0], steps[:, 1]).sum())
+
+
+def verify_challenge(challenge_number, output_prefixes=OUTPUT_PREFIXES):
+    """Score the outputs of one challenge.
+
+    return: list of (prefix, length, error), where length is None for a
+    missing file and nan for an invalid tour, whose |error| says why.
+    """
+    cities = load_cities(f'input_{challenge_number}.csv', cache=True)
+    N = len(cities)
+    results = []
+    for output_prefix in output_prefixes:
+        output_file = f'{output_prefix}_{challenge_number}.csv'
+        if not os.path.exists(output_file):
+            results.append((output_prefix, None, None))
+            continue
+        try:
+            tour = read_tour(output_file, N)
+        except ValueError as e:
+            results.append((output_prefix, float('nan'), str(e)))
+            continue
+        if is_permutation(tour, N):
+            results.append((output_prefix, path_length(tour, cities), None))
+        else:
+            results.append((output_prefix, float('nan'),
+                            'not a permutation of the cities'))
+    return results
 
-def distance(city1, city2):
-    return math.sqrt((city1[0] - city2[0]) ** 2 + (city1[1] - city2[1]) ** 2)
 
+def verify_output(output_prefixes=OUTPUT_PREFIXES, challenges=None,
+                  workers=None):
+    """Score every output of every challenge, one challenge per process.
 
-def verify_output():
-    for challenge_number in range(CHALLENGES):
-        print(f'Challenge {challenge_number}')
-        cities = read_input(f'input_{challenge_number}.csv')
-        N = len(cities)
-        #for output_prefix in ('output', 'sample/random', 'sample/greedy', 'sample/mst', 'sample/sa'):
-        for output_prefix in ('sample/random', 'sample/greedy', 'sample/mst'):
-            output_file = f'{output_prefix}_{challenge_number}.csv'
-            with open(output_file) as f:
-                lines = f.readlines()
-                assert lines[0].strip() == 'index'
-                tour = [int(i.strip()) for i in lines[1:N + 1]]
-            assert set(tour) == set(range(N))
-            path_length = sum(distance(cities[tour[i]], cities[tour[(i + 1) % N]])
-                              for i in range(N))
-            print(f'{output_prefix:16}: {path_length:>10.2f}')
-        print()
+    return: True if every existing output is a valid tour.
+    """
+    if challenges is None:
+        challenges = range(CHALLENGES)
+    challenges = list(challenges)
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        scores = pool.map(verify_challenge, challenges,
+                          [output_prefixes] * len(challenges))
+        ok = True
+        for challenge_number, results in zip(challenges, scores):
+            print(f'Challenge {challenge_number}')
+            for output_prefix, length, error in results:
+                if length is None:
+                    print(f'{output_prefix:16}: {"missing":>10}')
+                elif np.isnan(length):
+                    print(f'{output_prefix:16}: {"invalid":>10} ({error})')
+                    ok = False
+                else:
+                    print(f'{output_prefix:16}: {length:>10.2f}')
+            print()
+    return ok
 
 
 if __name__ == '__main__':
-    verify_output()
+    # Usage: output_verifier.py [output_prefix ...]
+    prefixes = tuple(sys.argv[1:]) or OUTPUT_PREFIXES
+    sys.exit(0 if verify_output(prefixes) else 1)
@@ -3,6 +3,7 @@ from common import format_tour, read_input
 import solver_greedy
 import solver_random
 import solver_mst
+import solver_lk
 
 CHALLENGES = 8
 
@@ -10,7 +11,7 @@ CHALLENGES = 8
 def generate_sample_output():
     for i in range(CHALLENGES):
         cities = read_input(f'input_{i}.csv')
-        for solver, name in ((solver_random, 'random'), (solver_greedy, 'greedy'), (solver_mst, 'mst')):
+        for solver, name in ((solver_random, 'random'), (solver_greedy, 'greedy'), (solver_mst, 'mst'), (solver_lk, 'lk')):
             tour = solver.solve(cities)
             with open(f'sample/{name}_{i}.csv', 'w') as f:
                 f.write(format_tour(tour) + '\n')
@@ -1,100 +1,190 @@
-import random
-import math
+import sys
+import time
+
 import numpy as np
+
 from common import print_tour, read_input
+from construction import nearest_neighbor_tour
+from distance import distance_matrix
+from local_search import improve
+from neighbors import nearest_neighbors
+
+# Individuals in the population.
+POPULATION_SIZE = 100
+
+# Share of the best individuals copied unchanged into the next generation.
+ELITE_FRACTION = 0.1
+
+# Probability that a child gets a random segment reversed.
+MUTATION_RATE = 0.1
 
+# Best children of each generation polished with 2-opt and Or-opt.
+POLISH_PER_GENERATION = 4
+
+GENERATIONS = 1000
+STAGNATION_LIMIT = 50
+
+# Wall-clock budget of genetic_algorithm(), in seconds.
+TIME_LIMIT = 300.0
 
-def distance(city1, city2):
-    return math.sqrt((city1[0] - city2[0]) ** 2 + (city1[1] - city2[1]) ** 2)
 
 def total_distance(tour, dist):
-    return sum(dist[tour[i]][tour[i+1]] for i in range(len(tour)-1)) + dist[tour[-1]][tour[0]]
-
-def create_initial_population(pop_size, num_cities, dist):
-    population = []
-    for _ in range(pop_size):
-        tour = list(range(num_cities))
-        random.shuffle(tour)
-        population.append([total_distance(tour, dist), tour])
+    tour = np.asarray(tour)
+    return dist[tour, np.roll(tour, -1)].sum()
+
+
+def tour_lengths(population, dist):
+    """Return the length of every tour (row) of |population| at once."""
+    return dist[population, np.roll(population, -1, axis=1)].sum(axis=1)
+
+
+def create_initial_population(pop_size, cities, rng, neighbors=None,
+                              deadline=None, callback=None):
+    """Return a (pop_size, N) array of polished nearest-neighbor tours.
+
+    Every tour starts from a different random city, so the population is
+    diverse but already far better than random permutations. Polishing
+    is slow on large inputs, so at |deadline| the population stops growing
+    and has fewer rows (at least one). |callback|, if given, is called as
+    callback(tour, length) with every tour shorter than the ones before.
+    """
+    N = len(cities)
+    starts = rng.choice(N, size=pop_size, replace=pop_size > N)
+    population = np.empty((pop_size, N), dtype=np.intp)
+    best_length = np.inf
+    for row, start in enumerate(starts):
+        if row > 0 and deadline is not None and time.time() > deadline:
+            return population[:row]
+        tour, length = improve(nearest_neighbor_tour(cities, int(start)),
+                               cities, neighbors)
+        population[row] = tour
+        if callback is not None and length < best_length:
+            best_length = length
+            callback(list(tour), float(length))
+    return population
+
+
+def crossover(parents1, parents2, rng):
+    """Order crossover (OX) of each row of |parents1| with |parents2|.
+
+    Child i keeps parents1[i] on a random slice [a, b) and gets the other
+    cities in the order they appear in parents2[i]. All children are built
+    together with boolean masks: the cities parents2[i] contributes, taken
+    row by row, fill the free positions of child i row by row.
+    """
+    C, N = parents1.shape
+    cuts = np.sort(rng.integers(0, N + 1, size=(C, 2)), axis=1)
+    positions = np.arange(N)
+    keep = (positions >= cuts[:, :1]) & (positions < cuts[:, 1:])
+    # kept[i, c]: city c is in the slice child i takes from parents1[i].
+    kept = np.zeros((C, N), dtype=bool)
+    np.put_along_axis(kept, parents1, keep, axis=1)
+    children = np.where(keep, parents1, 0)
+    children[~keep] = parents2[~np.take_along_axis(kept, parents2, axis=1)]
+    return children
+
+
+def mutate(population, rng, mutation_rate=MUTATION_RATE):
+    """Reverse a random segment of each row with probability |mutation_rate|.
+
+    A reversal is a 2-opt move, so unlike swapping two cities it changes
+    only two edges of the tour.
+    """
+    P, N = population.shape
+    rows = np.flatnonzero(rng.random(P) < mutation_rate)
+    if len(rows) == 0:
+        return population
+    cuts = np.sort(rng.integers(0, N, size=(len(rows), 2)), axis=1)
+    a, b = cuts[:, :1], cuts[:, 1:]
+    positions = np.arange(N)
+    inside = (positions >= a) & (positions <= b)
+    index = np.where(inside, a + b - positions, positions)
+    population[rows] = np.take_along_axis(population[rows], index, axis=1)
     return population
 
 
-def crossover(parent1, parent2):
-    size = len(parent1)
-    start, end = sorted(random.sample(range(size), 2))
-    child = [None] * size
-    child[start:end] = parent1[start:end]
-
-    # Fill the child with the remaining cities
-    j = 0
-    for i in range(size):
-        if child[i] is None:
-            while parent2[j] in child:
-                j += 1 
-            child[i] = parent2[j]
-    return child
-
-def mutate(tour, mutation_rate=0.1):
-    for i in range(len(tour)):
-        if random.random() < mutation_rate:
-            j = random.randint(0, len(tour)-1)
-            tour[i], tour[j] = tour[j], tour[i]
-    return tour
-
-def evolve_population(population, dist, mutation_rate=0.1):
-    fitness_values = np.array([1 / p[0] for p in population])
-    total_fitness = np.sum(fitness_values)
-    selection_probs = fitness_values / total_fitness
-    new_population = []
-    for _ in range(len(population)):
-        parents_idx = np.random.choice(len(population), size=2, p=selection_probs)
-        parent1, parent2 = population[parents_idx[0]][1], population[parents_idx[1]][1]
-        
-        child = crossover(parent1, parent2)
-        child = mutate(child, mutation_rate)
-        new_population.append([total_distance(child, dist), child])
-    return new_population
-
-def genetic_algorithm(cities, dist):
+def evolve_population(population, lengths, dist, rng, cities, neighbors=None,
+                      mutation_rate=MUTATION_RATE, polish=POLISH_PER_GENERATION):
+    """Return the next generation and its tour lengths.
+
+    Parents are picked by binary tournaments. The best ELITE_FRACTION of the
+    current generation survive unchanged; the best |polish| children are
+    improved with 2-opt and Or-opt before they join the population.
+    """
+    P = len(population)
+    elites = max(1, int(P * ELITE_FRACTION))
+    C = P - elites
+
+    pairs = rng.integers(0, P, size=(2 * C, 2))
+    winners = np.where(lengths[pairs[:, 0]] <= lengths[pairs[:, 1]],
+                       pairs[:, 0], pairs[:, 1])
+    children = crossover(population[winners[:C]], population[winners[C:]], rng)
+    children = mutate(children, rng, mutation_rate)
+    child_lengths = tour_lengths(children, dist)
+
+    for row in np.argsort(child_lengths)[:polish]:
+        tour, length = improve(children[row].tolist(), cities, neighbors)
+        children[row] = tour
+        child_lengths[row] = length
+
+    best = np.argsort(lengths)[:elites]
+    return (np.concatenate((population[best], children)),
+            np.concatenate((lengths[best], child_lengths)))
+
+
+def genetic_algorithm(cities, dist, pop_size=POPULATION_SIZE,
+                      generations=GENERATIONS, time_limit=TIME_LIMIT, seed=0,
+                      deadline=None, callback=None):
+    """Evolve a population of tours; return the best tour found.
+
+    Stops after |generations|, STAGNATION_LIMIT generations without
+    improvement, or at |deadline| (default: |time_limit| seconds from now),
+    whichever comes first. |callback|, if given, is called as
+    callback(tour, length) with every new best tour.
+    """
+    if deadline is None:
+        deadline = time.time() + time_limit
     num_cities = len(cities)
-    pop_size = max(100, 5 * num_cities)
-    generations = num_cities * 10
-    stagnation_limit = 10
+    if num_cities < 4:
+        return list(range(num_cities))
+    rng = np.random.default_rng(seed)
+    neighbors = nearest_neighbors(cities)
     mutation_rate = 0.05 if num_cities > 50 else 0.1
-    
-    population = create_initial_population(pop_size, num_cities, dist)
-    best_tour = min(population, key=lambda x: x[0])
-    best_distance = best_tour[0]
-    stagnation_count = 0
 
-    for generation in range(generations):
-        population = evolve_population(population, dist, mutation_rate)
-        current_best = min(population, key=lambda x: x[0])
-        current_best_distance = current_best[0]
-        #print(current_best_distance)
+    population = create_initial_population(pop_size, cities, rng, neighbors,
+                                           deadline, callback)
+    lengths = tour_lengths(population, dist)
+    best = int(lengths.argmin())
+    best_tour, best_distance = population[best].copy(), lengths[best]
+    stagnation_count = 0
 
-        if current_best_distance < best_distance:
-            best_tour = current_best
-            best_distance = current_best_distance
+    for _ in range(generations):
+        if time.time() > deadline or stagnation_count >= STAGNATION_LIMIT:
+            break
+        population, lengths = evolve_population(
+            population, lengths, dist, rng, cities, neighbors, mutation_rate)
+        current = int(lengths.argmin())
+        if lengths[current] < best_distance:
+            best_tour, best_distance = population[current].copy(), lengths[current]
             stagnation_count = 0
-        elif current_best_distance == best_distance:
+            if callback is not None:
+                callback(best_tour.tolist(), float(best_distance))
+        else:
             stagnation_count += 1
 
-        print(f'Generation {generation}: Best Distance = {best_distance}')
+    return best_tour.tolist()
 
-def solve(cities):
-    N = len(cities)
 
-    dist = [[0] * N for _ in range(N)]
-    for i in range(N):
-        for j in range(i, N):
-            dist[i][j] = dist[j][i] = distance(cities[i], cities[j])
+def solve(cities, time_limit=TIME_LIMIT, deadline=None, callback=None):
+    dist = distance_matrix(cities)
 
-    best_tour = genetic_algorithm(cities, dist)
+    best_tour = genetic_algorithm(cities, dist, time_limit=time_limit,
+                                  deadline=deadline, callback=callback)
+    print(f"Total Distance: {total_distance(best_tour, dist)}",
+          file=sys.stderr)
     return best_tour
 
 
-
 if __name__ == '__main__':
     #filename = 'input_5.csv'
     #cities = read_input(filename)
@@ -104,4 +194,4 @@ if __name__ == '__main__':
     cities = read_input(filename)
     tour6 = solve(cities)
 
-    print_tour(tour6)
\ No newline at end of file
+    print_tour(tour6)
@@ -1,32 +1,13 @@
 import sys
-import math
 
 from common import print_tour, read_input
-
-
-def distance(city1, city2):
-    return math.sqrt((city1[0] - city2[0]) ** 2 + (city1[1] - city2[1]) ** 2)
+from construction import nearest_neighbor_tour
 
 
 def solve(cities):
-    N = len(cities)
-
-    dist = [[0] * N for i in range(N)]
-    for i in range(N):
-        for j in range(i, N):
-            dist[i][j] = dist[j][i] = distance(cities[i], cities[j])
-
-    current_city = 0
-    unvisited_cities = set(range(1, N))
-    tour = [current_city]
-
-    while unvisited_cities:
-        next_city = min(unvisited_cities,
-                        key=lambda city: dist[current_city][city])
-        unvisited_cities.remove(next_city)
-        tour.append(next_city)
-        current_city = next_city
-    return tour
+    # The unvisited cities are kept in a spatial grid, so each step only looks
+    # at the cells around the current city instead of a full distance row.
+    return nearest_neighbor_tour(cities)
 
 
 if __name__ == '__main__':
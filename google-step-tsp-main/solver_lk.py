@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+
+from common import print_tour, read_input
+from construction import nearest_neighbor_tour
+from local_search import EPSILON, LocalSearch
+from neighbors import nearest_neighbors
+
+# Wall-clock budget of solve(), in seconds.
+TIME_LIMIT = 60.0
+
+# Kicks in a row without improvement, per city, after which the search stops
+# before the time limit. Small inputs are optimal long before it.
+STAGNATION_PER_CITY = 2
+
+# Candidate neighbors per city; LK needs a few more than plain 2-opt.
+NUM_NEIGHBORS = 10
+
+# How many edges one LK move may exchange before it gives up.
+MAX_DEPTH = 30
+
+# How many choices of the first added edge are tried before giving up.
+BREADTH = 5
+
+
+class LinKernighan(LocalSearch):
+    """Local search with Lin-Kernighan style variable-depth moves.
+
+    A move starts by removing a tour edge (t1, t2). It then repeatedly adds
+    an edge from the free end t2 to a candidate neighbor t3 and removes the
+    edge (t3, t4) that keeps the result a tour, so each step is one 2-opt
+    flip. t4 becomes the new free end. The chain stops when the running gain
+    cannot pay for another added edge or |max_depth| is reached, and the
+    prefix of flips with the best closed-tour gain is kept; the rest are
+    undone. Edges added during a move are never removed by the same move.
+    """
+
+    def __init__(self, tour, cities, neighbors=None, max_depth=MAX_DEPTH,
+                 breadth=BREADTH):
+        super().__init__(tour, cities, neighbors)
+        self.max_depth = max_depth
+        self.breadth = breadth
+
+    def try_lk(self, t1):
+        """Apply the first improving LK move starting at |t1|."""
+        for t2 in (self.next(t1), self.prev(t1)):
+            if self._lk_from(t1, t2):
+                return True
+        return False
+
+    def _choices(self, t1, t2, g, added):
+        """Return (t3, t4) pairs for the next step, most promising first."""
+        d = self.d
+        step = self.prev if self.next(t1) == t2 else self.next
+        t2_next, t2_prev = self.next(t2), self.prev(t2)
+        choices = []
+        for t3 in self.neighbors[t2]:
+            g1 = g - d(t2, t3)
+            if g1 <= EPSILON:
+                break
+            if t3 == t1 or t3 == t2_next or t3 == t2_prev:
+                continue
+            t4 = step(t3)
+            if (t3, t4) in added or (t4, t3) in added:
+                continue
+            choices.append((d(t3, t4) - d(t2, t3), t3, t4))
+        choices.sort(reverse=True)
+        return [(t3, t4) for _, t3, t4 in choices]
+
+    def _lk_from(self, t1, start):
+        d = self.d
+        for first in self._choices(t1, start, d(t1, start), ())[:self.breadth]:
+            t2 = start
+            flips = []
+            added = set()
+            touched = {t1, t2}
+            best_gain, best_flips = EPSILON, 0
+            g = d(t1, t2)
+            choice = first
+            while choice is not None and len(flips) < self.max_depth:
+                t3, t4 = choice
+                # Replace (t1, t2), (t3, t4) by (t2, t3), (t1, t4).
+                self.exchange(t2, t1, t3, t4)
+                flips.append((t2, t1, t3, t4))
+                added.add((t2, t3))
+                touched.update((t3, t4))
+                g += d(t3, t4) - d(t2, t3)
+                gain = g - d(t4, t1)
+                if gain > best_gain:
+                    best_gain, best_flips = gain, len(flips)
+                t2 = t4
+                choices = self._choices(t1, t2, g, added)
+                choice = choices[0] if choices else None
+            while len(flips) > best_flips:
+                a, b, c, e = flips.pop()
+                self.exchange(a, c, b, e)
+            if best_flips:
+                self.cost.apply(best_gain)
+                self.wake(*touched)
+                return True
+        return False
+
+    def default_moves(self):
+        return (self.try_lk, self.try_or_opt)
+
+
+def solve(cities, time_limit=TIME_LIMIT, deadline=None, callback=None,
+          kicks=None):
+    # |deadline| (a time.time() value) overrides |time_limit|. |callback| is
+    # called as callback(tour, length) whenever a better tour is found.
+    # |kicks|, if given, also stops the search after that many kicks.
+    if deadline is None:
+        deadline = time.time() + time_limit
+    neighbors = nearest_neighbors(cities, NUM_NEIGHBORS)
+    tour = nearest_neighbor_tour(cities)
+    search = LinKernighan(tour, cities, neighbors)
+    if callback is not None:
+        callback(list(tour), search.cost.value)
+    # Once LK converges, spend what is left of the budget on kicks, unless
+    # they stop finding anything first.
+    tour = search.iterate(deadline=deadline, iterations=kicks,
+                          callback=callback,
+                          stagnation=STAGNATION_PER_CITY * len(cities))
+    print(f"Total Distance: {search.cost.value}", file=sys.stderr)
+    return tour
+
+
+if __name__ == '__main__':
+    assert len(sys.argv) > 1
+    tour = solve(read_input(sys.argv[1]))
+    print_tour(tour)
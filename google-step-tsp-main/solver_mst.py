@@ -2,11 +2,9 @@ import sys
 import numpy as np
 from sklearn.cluster import KMeans
 from common import print_tour, read_input
-from unionFind import unionFind
-
-
-def distance(city1, city2):
-    return np.linalg.norm(np.array(city1) - np.array(city2))
+from construction import greedy_edges, nearest_neighbor_tour
+from distance import distance_matrix
+from local_search import improve
 
 
 def total_distance(tour, dist):
@@ -16,28 +14,9 @@ def total_distance(tour, dist):
     )
 
 
-def create_mst(dist, N):
-    """Create a minimum spanning tree"""
-    edges = []
-    for i in range(N):
-        for j in range(i + 1, N):
-            edges.append((dist[i, j], i, j))
-    edges.sort()
-    uf = unionFind(N)
-    mst = [[] for _ in range(N)]
-
-    for w, u, v in edges:
-        if not uf.same(u, v) and len(mst[u]) < 2 and len(mst[v]) < 2:
-            mst[u].append(v)
-            mst[v].append(u)
-            uf.unite(u, v)
-
-    one_edge_node = [i for i in range(N) if len(mst[i]) == 1]
-    if len(one_edge_node) >= 2:
-        mst[one_edge_node[0]].append(one_edge_node[1])
-        mst[one_edge_node[1]].append(one_edge_node[0])
-
-    return mst
+def create_mst(cities, N):
+    """Create a greedy-edge cycle on the k-nearest-neighbor candidate graph"""
+    return greedy_edges(cities)
 
 
 def create_path(mst, N):
@@ -56,26 +35,10 @@ def create_path(mst, N):
     return path
 
 
-def nearest_neighbor(dist, N):
-    """Creat a path by nearest neighbor heuristic"""
-    start = 0
-    tour = [start]
-    unvisited = set(range(1, N))
-    current = start
-
-    while unvisited:
-        next_city = min(unvisited, key=lambda city: dist[current, city])
-        unvisited.remove(next_city)
-        tour.append(next_city)
-        current = next_city
-
-    return tour
-
-
 def solve_cluster_tsp(cities, dist):
     N = len(cities)
-    initial_tour = nearest_neighbor(dist, N)
-    mst = create_mst(dist, N)
+    initial_tour = nearest_neighbor_tour(cities)
+    mst = create_mst(cities, N)
     mst_tour = create_path(mst, N)
 
     if total_distance(initial_tour, dist) < total_distance(mst_tour, dist):
@@ -86,30 +49,9 @@ def solve_cluster_tsp(cities, dist):
     return tour
 
 
-def two_opt(tour, dist):
-    """2-opt algorithm to improve the solution"""
-    N = len(tour)
-    improved = True
-    while improved:
-        improved = False
-        for i in range(N - 2):
-            for j in range(i + 2, N):
-                l1 = dist[tour[i]][tour[i + 1]]
-                l2 = dist[tour[j]][tour[(j + 1) % N]]
-                l3 = dist[tour[i]][tour[j]]
-                l4 = dist[tour[i + 1]][tour[(j + 1) % N]]
-                if l1 + l2 > l3 + l4:
-                    tour[i + 1 : j + 1] = reversed(tour[i + 1 : j + 1])
-                    improved = True
-    return tour
-
-
 def solve(cities):
     N = len(cities)
     cities = np.array(cities)
-    dist = np.array(
-        [[distance(cities[i], cities[j]) for j in range(N)] for i in range(N)]
-    )
 
     # K-means clustering to divide the cities
     num_clusters = max(1, N // 100)
@@ -120,30 +62,21 @@ def solve(cities):
     # Solve TSP for each cluster
     cluster_tours = []
     for cluster in clusters:
-        cluster_dist = dist[np.ix_(cluster, cluster)]
+        cluster_dist = distance_matrix(cities[cluster])
         cluster_tour = solve_cluster_tsp(cities[cluster], cluster_dist)
         cluster_tours.append([cluster[i] for i in cluster_tour])
 
     # Connect clusters
     cluster_centroids = kmeans.cluster_centers_
-    cluster_distances = np.array(
-        [
-            [
-                distance(cluster_centroids[i], cluster_centroids[j])
-                for j in range(num_clusters)
-            ]
-            for i in range(num_clusters)
-        ]
-    )
-    cluster_tour_order = solve_cluster_tsp(list(range(num_clusters)), cluster_distances)
+    cluster_distances = distance_matrix(cluster_centroids)
+    cluster_tour_order = solve_cluster_tsp(cluster_centroids, cluster_distances)
 
     # Combine cluster tours
     final_tour = []
     for cluster_idx in cluster_tour_order:
         final_tour.extend(cluster_tours[cluster_idx])
 
-    final_tour = two_opt(final_tour, dist)
-    total_dist = total_distance(final_tour, dist)
+    final_tour, total_dist = improve(final_tour, cities)
     print(f"Total Distance: {total_dist}")
 
     return final_tour
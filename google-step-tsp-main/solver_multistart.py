@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import concurrent.futures
+import os
+import random
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import solver_lk
+from common import print_tour, read_input
+from construction import (christofides_tour, greedy_edges,
+                          nearest_neighbor_tour, tour_from_cycle)
+from local_search import double_bridge
+from neighbors import nearest_neighbors
+
+# Wall-clock budget of solve(), in seconds, shared by all the starts.
+TIME_LIMIT = 60.0
+
+# Randomized starts per worker process.
+STARTS_PER_WORKER = 4
+
+# Each worker keeps the shared coordinates and the neighbor lists here, so
+# they are set up once per process instead of once per start.
+_worker = {}
+
+
+def _init_worker(name, N):
+    memory = shared_memory.SharedMemory(name=name)
+    coords = np.ndarray((N, 2), dtype=np.float64, buffer=memory.buf)
+    cities = [tuple(xy) for xy in coords.tolist()]
+    _worker['memory'] = memory
+    _worker['cities'] = cities
+    _worker['neighbors'] = nearest_neighbors(cities, solver_lk.NUM_NEIGHBORS)
+
+
+def initial_tour(cities, seed, neighbors=None):
+    """Return the initial tour of start |seed|.
+
+    Seeds cycle through nearest neighbor (from a random city), greedy edge
+    and Christofides. Apart from the first round, the tour also gets a few
+    random double-bridge kicks so no two starts begin from the same tour.
+    """
+    rng = random.Random(seed)
+    kind = seed % 3
+    if kind == 0:
+        tour = nearest_neighbor_tour(cities, rng.randrange(len(cities)))
+    elif kind == 1:
+        tour = tour_from_cycle(greedy_edges(cities, neighbors))
+    else:
+        tour = christofides_tour(cities, neighbors)
+    if seed >= 3:
+        for _ in range(rng.randint(1, 10)):
+            tour = double_bridge(tour, rng)
+    return tour
+
+
+def run_start(seed, deadline):
+    """Run one start in a worker; return (length, seed, tour) or None."""
+    if time.time() >= deadline:
+        return None
+    cities, neighbors = _worker['cities'], _worker['neighbors']
+    tour = initial_tour(cities, seed, neighbors)
+    search = solver_lk.LinKernighan(tour, cities, neighbors)
+    search.optimize(deadline=deadline)
+    return search.cost.value, seed, tour
+
+
+def solve(cities, time_limit=TIME_LIMIT, workers=None, starts=None, seed=0,
+          deadline=None, callback=None):
+    """Run randomized LK starts on a process pool; return the best tour.
+
+    The coordinates are put in shared memory once and every worker reads
+    them from there, so nothing of size N is pickled per start (and no
+    distance matrix exists at all). Starts use seeds |seed|, |seed| + 1, ...
+    |deadline| overrides |time_limit|; |callback|, if given, is called as
+    callback(tour, length) whenever a start beats the best so far.
+    """
+    if deadline is None:
+        deadline = time.time() + time_limit
+    N = len(cities)
+    if N < 8:
+        return solver_lk.solve(cities, deadline=deadline, callback=callback)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if starts is None:
+        starts = workers * STARTS_PER_WORKER
+
+    coords = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+    memory = shared_memory.SharedMemory(create=True, size=coords.nbytes)
+    try:
+        np.ndarray(coords.shape, dtype=np.float64, buffer=memory.buf)[:] = coords
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_init_worker,
+                initargs=(memory.name, N)) as pool:
+            futures = [pool.submit(run_start, s, deadline)
+                       for s in range(seed, seed + starts)]
+            best = None
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                if result is not None and (best is None or result < best):
+                    best = result
+                    if callback is not None:
+                        callback(list(best[2]), best[0])
+    finally:
+        memory.close()
+        memory.unlink()
+
+    if best is None:
+        # The budget ran out before any start got going.
+        return nearest_neighbor_tour(cities)
+    length, best_seed, tour = best
+    print(f"Total Distance: {length} (start {best_seed} of {starts})",
+          file=sys.stderr)
+    return tour
+
+
+if __name__ == '__main__':
+    assert len(sys.argv) > 1
+    tour = solve(read_input(sys.argv[1]))
+    print_tour(tour)
@@ -1,10 +1,10 @@
 import sys
 from common import print_tour, read_input
-from unionFind import unionFind
+from construction import christofides_tour, double_tree_tour, greedy_edges
+from hilbert import hilbert_tour
+from local_search import improve, iterated_local_search
 
-
-def distance(city1, city2):
-    return ((city1[0] - city2[0]) ** 2 + (city1[1] - city2[1]) ** 2) ** 0.5
+CONSTRUCTIONS = ("greedy", "double_tree", "christofides", "hilbert")
 
 
 def total_distance(tour, dist):
@@ -14,36 +14,10 @@ def total_distance(tour, dist):
     )
 
 
-# Create a minimum spanning tree
-def create_mst(dist, N):
-    edges = []
-    for i in range(N):
-        for j in range(i + 1, N):
-            edges.append((dist[i][j], i, j))
-    edges.sort()
-    uf = unionFind(N)
-    mst = [[] for i in range(N)]
-
-    for i in range(len(edges)):
-        w, u, v = edges[i]
-        # Not to create a cycle and not to have more than 2 edges
-        if not uf.same(u, v) and len(mst[u]) < 2 and len(mst[v]) < 2:
-            mst[u].append(v)
-            mst[v].append(u)
-            uf.unite(u, v)
-
-    # Connect the two nodes with only one edge
-    one_edge_node = []
-    for i in range(N):
-        if len(mst[i]) == 1:
-            one_edge_node.append(i)
-
-    # Check if there are two nodes with only one edge
-    if len(one_edge_node) >= 2:
-        mst[one_edge_node[0]].append(one_edge_node[1])
-        mst[one_edge_node[1]].append(one_edge_node[0])
-
-    return mst
+# Create the greedy-edge cycle ("MST" with at most 2 edges per node) on the
+# k-nearest-neighbor candidate graph instead of all N^2 edges
+def create_mst(cities, N):
+    return greedy_edges(cities)
 
 
 # Create a path from the minimum spanning tree
@@ -64,36 +38,33 @@ def create_path(mst, N):
     return path
 
 
-# 2-opt algorithm to improve the solution
-def two_opt(tour, dist):
-    N = len(tour)
-    while True:
-        count = 0
-        for i in range(N - 2):
-            for j in range(i + 2, N):
-                l1 = dist[tour[i]][tour[i + 1]]
-                l2 = dist[tour[j]][tour[(j + 1) % N]]
-                l3 = dist[tour[i]][tour[j]]
-                l4 = dist[tour[i + 1]][tour[(j + 1) % N]]
-                if l1 + l2 > l3 + l4:
-                    tour[i + 1 : j + 1] = reversed(tour[i + 1 : j + 1])
-                    count += 1
-        if count == 0:
-            break
-    return tour
-
-
-def solve(cities):
+# |construction|: "greedy" (greedy edge), "double_tree" (MST preorder walk),
+# "christofides" (MST + greedy matching of odd nodes, shortcut Euler circuit)
+# or "hilbert" (order along a Hilbert curve)
+def solve(cities, construction="greedy", time_limit=None):
+    # With |time_limit| (seconds), the converged tour is kicked with double
+    # bridges and re-optimized until the time runs out.
+    if construction not in CONSTRUCTIONS:
+        raise ValueError(
+            f"unknown construction: {construction!r} "
+            f"(expected one of {', '.join(CONSTRUCTIONS)})"
+        )
     N = len(cities)
-    dist = [[0] * N for i in range(N)]
-    for i in range(N):
-        for j in range(i, N):
-            dist[i][j] = dist[j][i] = distance(cities[i], cities[j])
-    mst = create_mst(dist, N)
-    tour = create_path(mst, N)
-    tour = two_opt(tour, dist)
-    
-    total_dist = total_distance(tour, dist)
+    if construction == "double_tree":
+        tour = double_tree_tour(cities)
+    elif construction == "christofides":
+        tour = christofides_tour(cities)
+    elif construction == "hilbert":
+        tour = hilbert_tour(cities)
+    else:
+        mst = create_mst(cities, N)
+        tour = create_path(mst, N)
+    if time_limit is None:
+        tour, total_dist = improve(tour, cities)
+    else:
+        tour, total_dist = iterated_local_search(tour, cities,
+                                                 time_limit=time_limit)
+
     print(f"Total Distance: {total_dist}")
 
     return tour
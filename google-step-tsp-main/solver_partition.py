@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+import concurrent.futures
+import os
+import sys
+
+import numpy as np
+
+import solver_lk
+from common import print_tour, read_input
+from construction import nearest_neighbor_tour
+from distance import coordinates
+from local_search import LocalSearch, improve
+from neighbors import nearest_neighbors
+
+# Largest number of cities solved as one cluster.
+CLUSTER_SIZE = 1000
+
+# Pairs of cities compared at once when looking for the closest pair of
+# cities between two clusters.
+BLOCK_ENTRIES = 1 << 20
+
+
+def partition(coords, cluster_size=CLUSTER_SIZE):
+    """Split the cities into spatially compact clusters of similar size.
+
+    The bounding box is cut at the median of its longer side, recursively,
+    until every part holds at most |cluster_size| cities (recursive
+    coordinate bisection). Unlike KMeans this is O(N log N), deterministic
+    and needs nothing beyond NumPy.
+
+    return: list of index arrays, one per cluster.
+    """
+    clusters = []
+    stack = [np.arange(len(coords))]
+    while stack:
+        indices = stack.pop()
+        if len(indices) <= cluster_size:
+            clusters.append(indices)
+            continue
+        points = coords[indices]
+        axis = int(np.ptp(points[:, 1]) > np.ptp(points[:, 0]))
+        half = len(indices) // 2
+        order = np.argpartition(points[:, axis], half)
+        stack.append(indices[order[half:]])
+        stack.append(indices[order[:half]])
+    return clusters
+
+
+def closest_pair(coords, a, b, exclude_a=-1, exclude_b=-1):
+    """Return the closest (i, j) with i in |a| and j in |b|.
+
+    |exclude_a| and |exclude_b| are skipped unless they are the only city
+    of their cluster.
+    """
+    if len(a) > 1:
+        a = a[a != exclude_a]
+    if len(b) > 1:
+        b = b[b != exclude_b]
+    best = (np.inf, -1, -1)
+    block = max(1, BLOCK_ENTRIES // len(b))
+    for start in range(0, len(a), block):
+        rows = a[start:start + block]
+        dx = coords[rows, 0, None] - coords[b, 0]
+        dy = coords[rows, 1, None] - coords[b, 1]
+        d = dx * dx + dy * dy
+        r, c = np.unravel_index(d.argmin(), d.shape)
+        if d[r, c] < best[0]:
+            best = (d[r, c], int(rows[r]), int(b[c]))
+    return best[1], best[2]
+
+
+class _PathSearch(solver_lk.LinKernighan):
+    """LK search for a Hamiltonian path from |first| to |last|.
+
+    The path is closed into a cycle by the edge (last, first), whose length
+    is made more negative than any gain a move could make, so no move ever
+    removes it.
+    """
+
+    def __init__(self, tour, cities, neighbors, first, last, diameter):
+        self.fixed = (first, last)
+        self.fixed_length = -2 * diameter - 1
+        super().__init__(tour, cities, neighbors)
+
+    def d(self, a, b):
+        if (a, b) == self.fixed or (b, a) == self.fixed:
+            return self.fixed_length
+        return super().d(a, b)
+
+
+def solve_path(cities, first, last):
+    """Return a short path through |cities| from |first| to |last|.
+
+    Runs in a worker process, on the coordinates of one cluster only.
+    """
+    N = len(cities)
+    if N <= 2:
+        return [first] if N == 1 else [first, last]
+    tour = nearest_neighbor_tour(cities, first)
+    tour.remove(last)
+    tour.append(last)
+    if N < 8:
+        return tour
+    xs = [x for x, _ in cities]
+    ys = [y for _, y in cities]
+    diameter = max(xs) - min(xs) + max(ys) - min(ys)
+    neighbors = nearest_neighbors(cities, solver_lk.NUM_NEIGHBORS)
+    search = _PathSearch(tour, cities, neighbors, first, last, diameter)
+    search.optimize()
+    start = tour.index(first)
+    tour = tour[start:] + tour[:start]
+    if tour[1] == last:
+        # The cycle was written the other way around.
+        tour = tour[:1] + tour[:0:-1]
+    return tour
+
+
+def solve(cities, cluster_size=CLUSTER_SIZE, workers=None,
+          time_limit=solver_lk.TIME_LIMIT, kicks=None):
+    """Solve |cities| cluster by cluster.
+
+    1. partition() splits the cities into compact clusters.
+    2. The cluster centroids are ordered by a small TSP.
+    3. Between consecutive clusters the closest pair of cities is chosen as
+       the exit of one and the entry of the next.
+    4. Every cluster is solved as a path from its entry to its exit, in
+       parallel worker processes that only see that cluster's coordinates.
+    5. The joined tour is repaired with 2-opt and Or-opt, starting only from
+       the cities whose neighbor lists reach into another cluster.
+
+    No N x N matrix is ever built, so memory grows linearly with N. Inputs
+    of a single cluster go to solver_lk with |time_limit| and |kicks|.
+    """
+    coords = coordinates(cities)
+    cities = [tuple(xy) for xy in coords.tolist()]
+    N = len(cities)
+    if N <= cluster_size:
+        return solver_lk.solve(cities, time_limit, kicks=kicks)
+
+    clusters = partition(coords, cluster_size)
+    centroids = [tuple(coords[c].mean(axis=0)) for c in clusters]
+    order, _ = improve(nearest_neighbor_tour(centroids), centroids)
+    clusters = [clusters[i] for i in order]
+
+    M = len(clusters)
+    entries = [-1] * M
+    exits = [-1] * M
+    for i in range(M):
+        j = (i + 1) % M
+        # The entry of cluster 0 is picked last, so it must avoid its exit.
+        exclude_b = exits[j] if j == 0 else -1
+        exits[i], entries[j] = closest_pair(coords, clusters[i], clusters[j],
+                                            entries[i], exclude_b)
+
+    jobs = []
+    for cluster, first, last in zip(clusters, entries, exits):
+        local = {int(c): k for k, c in enumerate(cluster)}
+        jobs.append(([cities[c] for c in cluster], local[first], local[last]))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            paths = list(pool.map(solve_path, *zip(*jobs)))
+    else:
+        paths = [solve_path(*job) for job in jobs]
+
+    tour = []
+    labels = np.empty(N, dtype=np.intp)
+    for k, (cluster, path) in enumerate(zip(clusters, paths)):
+        tour.extend(int(cluster[c]) for c in path)
+        labels[cluster] = k
+
+    neighbors = nearest_neighbors(cities)
+    boundary = [i for i in range(N)
+                if any(labels[j] != labels[i] for j in neighbors[i])]
+    boundary = list(dict.fromkeys(boundary + entries + exits))
+    search = LocalSearch(tour, cities, neighbors, active=boundary)
+    search.optimize()
+    print(f"Total Distance: {search.cost.value}", file=sys.stderr)
+    return tour
+
+
+if __name__ == '__main__':
+    assert len(sys.argv) > 1
+    tour = solve(read_input(sys.argv[1]))
+    print_tour(tour)
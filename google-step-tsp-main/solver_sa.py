@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+import math
+import os
+import random
+import sys
+import time
+
+from common import format_tour, print_tour, read_input
+from construction import nearest_neighbor_tour
+from local_search import EPSILON, REPORT_INTERVAL, LocalSearch, improve
+from neighbors import nearest_neighbors
+
+# Wall-clock budget of solve(), in seconds.
+TIME_LIMIT = 60.0
+
+# Candidate neighbors per city; every move adds an edge to one of them.
+NUM_NEIGHBORS = 8
+
+# Probability of accepting an average uphill move at the start and at the end
+# of the schedule. The temperatures follow from the instance's own deltas.
+INITIAL_ACCEPTANCE = 0.02
+FINAL_ACCEPTANCE = 1e-4
+
+# Moves between temperature updates and deadline checks.
+MOVES_PER_STEP = 1000
+
+# Seconds between two writes of the checkpoint file.
+CHECKPOINT_INTERVAL = 10.0
+
+
+def write_checkpoint(path, tour):
+    """Write |tour| to |path| so a reader never sees a partial file."""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(format_tour(tour) + '\n')
+    os.replace(tmp, path)
+
+
+class SimulatedAnnealing(LocalSearch):
+    """Simulated annealing over 2-opt and Or-opt moves.
+
+    A move picks a random city and a random candidate neighbor and adds the
+    edge between them, either as a 2-opt move or by moving a segment of one
+    to three cities next to the neighbor. Its delta is read off the four to
+    six edges involved, so scoring a move is O(1) whatever N is.
+
+    The temperature falls geometrically with the share of the time budget
+    used, so the schedule ends on time on any machine; its ends are set from
+    the uphill deltas sampled on the instance itself.
+    """
+
+    def __init__(self, tour, cities, neighbors=None, rng=None):
+        super().__init__(tour, cities, neighbors)
+        self.rng = rng or random.Random(0)
+        self.best = list(tour)
+        self.best_value = self.cost.value
+
+    def random_move(self):
+        """Return (delta, apply) of a random move, or None if it is invalid."""
+        rng, d = self.rng, self.d
+        a = rng.randrange(self.N)
+        c = rng.choice(self.neighbors[a])
+        if rng.random() < 0.5:
+            succ, pred = self.next, self.prev
+        else:
+            succ, pred = self.prev, self.next
+        if rng.random() < 0.5:
+            b, e = succ(a), succ(c)
+            if c == b or e == a:
+                return None
+            delta = d(a, c) + d(b, e) - d(a, b) - d(c, e)
+            return delta, lambda: self.exchange(a, b, c, e)
+
+        # Move the segment a..last next to c, a ending up beside c.
+        last = a
+        for _ in range(self.rng.randrange(3)):
+            last = succ(last)
+        p, n = pred(a), succ(last)
+        e = succ(c) if rng.random() < 0.5 else pred(c)
+        segment = {a, last, succ(a)}
+        if c in segment or e in segment or n == p:
+            return None
+        delta = (d(c, a) + d(last, e) - d(c, e)
+                 - d(p, a) - d(last, n) + d(p, n))
+        if succ == self.next:
+            return delta, lambda: self.move_segment(a, last, c, e, a)
+        return delta, lambda: self.move_segment(last, a, c, e, a)
+
+    def sample_uphill(self, samples=1000):
+        """Return the mean delta of random uphill moves."""
+        deltas = []
+        for _ in range(samples):
+            move = self.random_move()
+            if move is not None and move[0] > EPSILON:
+                deltas.append(move[0])
+        return sum(deltas) / len(deltas) if deltas else 1.0
+
+    def save_best(self):
+        if self.cost.value < self.best_value - EPSILON:
+            self.best = self.tour.to_list()
+            self.best_value = self.cost.value
+
+    def anneal(self, deadline, checkpoint=None, callback=None, moves=None):
+        """Anneal until |deadline|; return the best tour seen.
+
+        |moves|: optional number of moves to try. The temperature then
+        follows the moves tried instead of the clock, so the result does not
+        depend on the speed of the machine; |deadline| still stops it.
+
+        |checkpoint|: optional file the best tour is written to every
+        CHECKPOINT_INTERVAL seconds, so a run cut short still leaves a result.
+        |callback|: optional callback(tour, length), called with new best
+        tours at most every REPORT_INTERVAL seconds.
+        """
+        if self.N < 8:
+            return self.best
+        start = time.time()
+        budget = max(deadline - start, 1e-9)
+        uphill = self.sample_uphill()
+        t0 = -uphill / math.log(INITIAL_ACCEPTANCE)
+        t1 = -uphill / math.log(FINAL_ACCEPTANCE)
+        rng = self.rng
+        cost = self.cost
+        next_checkpoint = start + CHECKPOINT_INTERVAL
+        next_report = start + REPORT_INTERVAL
+        written = reported = None
+        tried = 0
+        while True:
+            now = time.time()
+            if now >= deadline or (moves is not None and tried >= moves):
+                break
+            if moves is None:
+                progress = (now - start) / budget
+            else:
+                progress = tried / moves
+            temperature = t0 * (t1 / t0) ** progress
+            tried += MOVES_PER_STEP
+            for _ in range(MOVES_PER_STEP):
+                move = self.random_move()
+                if move is None:
+                    continue
+                delta, apply = move
+                if delta > 0:
+                    if rng.random() >= math.exp(-delta / temperature):
+                        continue
+                    # The tour is at a local low point; it may be the best.
+                    self.save_best()
+                apply()
+                cost.apply(-delta)
+            if callback is not None and now >= next_report:
+                next_report = now + REPORT_INTERVAL
+                if reported != self.best_value:
+                    callback(list(self.best), self.best_value)
+                    reported = self.best_value
+            if checkpoint is not None and now >= next_checkpoint:
+                next_checkpoint = now + CHECKPOINT_INTERVAL
+                if written != self.best_value:
+                    write_checkpoint(checkpoint, self.best)
+                    written = self.best_value
+        self.save_best()
+        if checkpoint is not None and written != self.best_value:
+            write_checkpoint(checkpoint, self.best)
+        return self.best
+
+
+def solve(cities, time_limit=TIME_LIMIT, checkpoint=None, seed=0,
+          deadline=None, callback=None, moves=None):
+    # |deadline| (a time.time() value) overrides |time_limit|. |callback| is
+    # called as callback(tour, length) whenever a better tour is found.
+    # |moves| fixes the length of the schedule, see anneal().
+    if deadline is None:
+        deadline = time.time() + time_limit
+    neighbors = nearest_neighbors(cities, NUM_NEIGHBORS)
+    tour = nearest_neighbor_tour(cities)
+    search = SimulatedAnnealing(tour, cities, neighbors, random.Random(seed))
+    if callback is not None:
+        callback(list(tour), search.cost.value)
+    tour = search.anneal(deadline, checkpoint, callback, moves)
+    # Finish with plain descent so the result is a 2-opt/Or-opt optimum.
+    tour, total_dist = improve(tour, cities, neighbors)
+    if callback is not None:
+        callback(list(tour), total_dist)
+    print(f"Total Distance: {total_dist}", file=sys.stderr)
+    return tour
+
+
+if __name__ == '__main__':
+    assert len(sys.argv) > 1
+    checkpoint = sys.argv[2] if len(sys.argv) > 2 else None
+    tour = solve(read_input(sys.argv[1]), checkpoint=checkpoint)
+    print_tour(tour)
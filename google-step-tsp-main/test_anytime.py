@@ -0,0 +1,48 @@
+import os
+import time
+import types
+import unittest
+
+import anytime
+import solver_greedy
+import solver_sa
+from common import read_input
+from local_search import tour_length
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def stuck_solve(cities, deadline=None, callback=None):
+    callback(list(range(len(cities))), 1.0)
+    while True:
+        time.sleep(0.01)
+
+
+class TestAnytime(unittest.TestCase):
+
+    def setUp(self):
+        self.cities = read_input(os.path.join(HERE, 'input_4.csv'))
+
+    def test_overrunning_solver_gives_best_reported_tour(self):
+        stuck = types.SimpleNamespace(solve=stuck_solve)
+        start = time.time()
+        tour = anytime.run(stuck, self.cities, 0.2)
+        self.assertLess(time.time() - start, 0.2 + anytime.GRACE + 0.5)
+        self.assertEqual(tour, list(range(len(self.cities))))
+
+    def test_solvers_without_callback_still_run(self):
+        tour = anytime.run(solver_greedy, self.cities, 5)
+        self.assertEqual(tour, solver_greedy.solve(self.cities))
+
+    def test_improvements_get_better(self):
+        found = list(anytime.improvements(solver_sa, self.cities,
+                                          time.time() + 2.5))
+        self.assertGreaterEqual(len(found), 2)
+        lengths = [length for _, length in found]
+        self.assertEqual(lengths, sorted(lengths, reverse=True))
+        tour, length = found[-1]
+        self.assertAlmostEqual(length, tour_length(tour, self.cities))
+
+
+if __name__ == '__main__':
+    unittest.main()
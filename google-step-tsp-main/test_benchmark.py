@@ -0,0 +1,47 @@
+import time
+import unittest
+
+import benchmark
+
+
+def record(solver, length, seconds):
+    return {'solver': solver, 'instance': 'input_5', 'valid': True,
+            'length': length, 'seconds': seconds}
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_regressions_against_baseline(self):
+        baseline = [record('a', 100.0, 10.0), record('b', 100.0, 10.0),
+                    record('c', 100.0, 10.0)]
+        results = [record('a', 100.5, 10.0), record('b', 103.0, 10.0),
+                   record('c', 100.0, 20.0),
+                   {'solver': 'd', 'instance': 'input_5', 'valid': False}]
+        lengths = [{'solver': r['solver'], 'instance': r['instance'],
+                    'length': r['length']} for r in baseline]
+        # Without timings of this machine, times are not compared.
+        problems = benchmark.find_regressions(results, lengths)
+        self.assertEqual(len(problems), 2)
+        self.assertIn('length', problems[0])
+        self.assertIn('invalid', problems[1])
+        problems = benchmark.find_regressions(results, lengths, baseline)
+        self.assertEqual(len(problems), 3)
+        self.assertIn('length', problems[0])
+        self.assertIn('time', problems[1])
+        self.assertIn('invalid', problems[2])
+
+    def test_nested_phases_are_charged_to_the_innermost(self):
+        timer = benchmark.PhaseTimer()
+        inner = timer.wrap('distance', lambda: time.sleep(0.05))
+
+        def outer():
+            time.sleep(0.05)
+            inner()
+        timer.wrap('construction', outer)()
+        timer.charge()
+        self.assertAlmostEqual(timer.totals['construction'], 0.05, delta=0.03)
+        self.assertAlmostEqual(timer.totals['distance'], 0.05, delta=0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
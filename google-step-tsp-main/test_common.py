@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from common import load_cities, read_input
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestLoadCities(unittest.TestCase):
+
+    def test_matches_read_input(self):
+        for i in (0, 5):
+            filename = os.path.join(HERE, f'input_{i}.csv')
+            cities = load_cities(filename)
+            self.assertEqual(cities.dtype, np.float64)
+            self.assertEqual(cities.tolist(),
+                             [list(xy) for xy in read_input(filename)])
+
+    def test_cache_follows_the_input_mtime(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'input.csv')
+            shutil.copy(os.path.join(HERE, 'input_1.csv'), filename)
+            first = load_cities(filename, cache=True)
+            self.assertTrue(os.path.exists(filename + '.npy'))
+            cached = load_cities(filename, cache=True)
+            self.assertIsInstance(cached, np.memmap)
+            np.testing.assert_array_equal(cached, first)
+            del cached
+
+            with open(filename, 'w') as f:
+                f.write('x,y\n1.5,2.5\n')
+            os.utime(filename, ns=(1, 1))
+            self.assertEqual(load_cities(filename, cache=True).tolist(),
+                             [[1.5, 2.5]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+import solver_ono
+from construction import (NUM_NEIGHBORS, _spanning_tree, candidate_edges,
+                          christofides_tour, double_tree_tour, greedy_edges,
+                          minimum_spanning_tree, nearest_neighbor_tour,
+                          tour_from_cycle)
+from hilbert import hilbert_keys, hilbert_tour, solve_renumbered
+from neighbors import nearest_neighbors
+from unionFind import unionFind
+
+
+def random_cities(n, seed):
+    random.seed(seed)
+    return [(random.uniform(0, 1600), random.uniform(0, 900)) for _ in range(n)]
+
+
+def edge_set(adj):
+    return {frozenset((u, v)) for u in range(len(adj)) for v in adj[u]}
+
+
+def cycle_length(adj, cities):
+    return sum(math.dist(cities[u], cities[v])
+               for u, v in map(tuple, edge_set(adj)))
+
+
+def brute_force_greedy_edges(cities):
+    N = len(cities)
+    edges = sorted((math.dist(cities[i], cities[j]), i, j)
+                   for i in range(N) for j in range(i + 1, N))
+    uf = unionFind(N)
+    adj = [[] for _ in range(N)]
+    for _, u, v in edges:
+        if len(adj[u]) < 2 and len(adj[v]) < 2 and uf.unite(u, v):
+            adj[u].append(v)
+            adj[v].append(u)
+    ends = [i for i in range(N) if len(adj[i]) == 1]
+    adj[ends[0]].append(ends[1])
+    adj[ends[1]].append(ends[0])
+    return adj
+
+
+def prim_weight(cities):
+    N = len(cities)
+    best = [math.inf] * N
+    best[0] = 0
+    in_tree = [False] * N
+    total = 0
+    for _ in range(N):
+        u = min((i for i in range(N) if not in_tree[i]), key=best.__getitem__)
+        in_tree[u] = True
+        total += best[u]
+        for v in range(N):
+            if not in_tree[v]:
+                best[v] = min(best[v], math.dist(cities[u], cities[v]))
+    return total
+
+
+class TestUnionFind(unittest.TestCase):
+
+    def test_long_chain_has_no_recursion_limit(self):
+        N = 50000
+        uf = unionFind(N)
+        for i in range(N - 1):
+            # Attach the growing set under a fresh root every time.
+            uf.par[uf.root(i)] = i + 1
+        self.assertEqual(uf.root(0), N - 1)
+        self.assertTrue(uf.same(0, N - 1))
+
+    def test_batches_match_single_calls(self):
+        random.seed(3)
+        xs = [random.randrange(100) for _ in range(150)]
+        ys = [random.randrange(100) for _ in range(150)]
+        single, batch = unionFind(100), unionFind(100)
+        expected = [single.unite(x, y) for x, y in zip(xs, ys)]
+        self.assertEqual(batch.unite_many(xs, ys), expected)
+        self.assertEqual(batch.components, single.components)
+        self.assertEqual(batch.components, 100 - sum(expected))
+        self.assertEqual(batch.same_many(xs, list(reversed(ys))),
+                         [single.same(x, y)
+                          for x, y in zip(xs, reversed(ys))])
+
+
+class TestConstruction(unittest.TestCase):
+
+    def test_greedy_edges_close_to_sorting_all_edges(self):
+        for seed in range(5):
+            cities = random_cities(200, seed)
+            adj = greedy_edges(cities)
+            expected = brute_force_greedy_edges(cities)
+            # The candidate graph may join the last fragments differently.
+            self.assertLess(len(edge_set(adj) - edge_set(expected)), 10)
+            self.assertLess(cycle_length(adj, cities),
+                            cycle_length(expected, cities) * 1.02)
+            tour = tour_from_cycle(adj)
+            self.assertEqual(sorted(tour), list(range(len(cities))))
+
+    def test_minimum_spanning_tree_on_separated_clusters(self):
+        random.seed(7)
+        # Three far apart clusters leave the candidate graph disconnected.
+        cities = [(random.gauss(0, 1) + 1000 * (i % 3), random.gauss(0, 1))
+                  for i in range(150)]
+        mst = minimum_spanning_tree(cities)
+        weight = sum(math.dist(cities[u], cities[v])
+                     for u, v in map(tuple, edge_set(mst)))
+        self.assertEqual(len(edge_set(mst)), len(cities) - 1)
+        self.assertAlmostEqual(weight, prim_weight(cities))
+
+    def test_minimum_spanning_tree_with_edges_missing_from_candidates(self):
+        random.seed(0)
+        # Two dense clusters 10 apart joined by a sparse arc: the k-NN edges
+        # connect everything through the arc but miss the edge between the
+        # clusters.
+        cities = ([(random.gauss(0, 1), random.gauss(0, 1)) for _ in range(30)]
+                  + [(random.gauss(10, 1), random.gauss(0, 1))
+                     for _ in range(30)]
+                  + [(5 + 60 * math.cos(t * math.pi / 10),
+                      60 * math.sin(t * math.pi / 10)) for t in range(1, 10)])
+        neighbors = nearest_neighbors(cities, NUM_NEIGHBORS)
+        uf = unionFind(len(cities))
+        for u, nb in enumerate(neighbors):
+            uf.unite_many([u] * len(nb), nb)
+        self.assertEqual(uf.components, 1)
+        coords = np.array(cities)
+        knn_tree = _spanning_tree(cities, coords,
+                                  *candidate_edges(cities, neighbors))
+        self.assertGreater(cycle_length(knn_tree, cities),
+                           prim_weight(cities) + 1)
+
+        mst = minimum_spanning_tree(cities, neighbors)
+        self.assertEqual(len(edge_set(mst)), len(cities) - 1)
+        self.assertAlmostEqual(cycle_length(mst, cities), prim_weight(cities))
+
+    def test_minimum_spanning_tree_on_degenerate_inputs(self):
+        line = [(3.0 * (i // 2), 7.0) for i in range(200)]
+        same = [(3.0, 4.0)] * 50
+        for cities in (line, same):
+            adj = minimum_spanning_tree(cities)
+            self.assertEqual(len(edge_set(adj)), len(cities) - 1)
+            self.assertAlmostEqual(cycle_length(adj, cities),
+                                   prim_weight(cities))
+
+    def test_nearest_neighbor_tour_matches_brute_force(self):
+        # Clustered cities make the grid rebuild and search empty cells.
+        cities = random_cities(300, 3) + [(x + 5000, y) for x, y in
+                                          random_cities(300, 4)]
+        unvisited = set(range(1, len(cities)))
+        expected = [0]
+        while unvisited:
+            current = cities[expected[-1]]
+            nearest = min(unvisited,
+                          key=lambda c: (math.dist(current, cities[c]), c))
+            unvisited.remove(nearest)
+            expected.append(nearest)
+        self.assertEqual(nearest_neighbor_tour(cities), expected)
+        self.assertEqual(nearest_neighbor_tour([]), [])
+        self.assertEqual(nearest_neighbor_tour([(3, 4)]), [0])
+
+    def test_mst_tours_are_permutations(self):
+        for n in (1, 2, 3, 5, 64, 300):
+            cities = random_cities(n, n)
+            for build in (double_tree_tour, christofides_tour):
+                self.assertEqual(sorted(build(cities)), list(range(n)))
+
+    def test_solver_rejects_unknown_construction(self):
+        cities = random_cities(64, 1)
+        for construction in solver_ono.CONSTRUCTIONS:
+            tour = solver_ono.solve(cities, construction)
+            self.assertEqual(sorted(tour), list(range(len(cities))))
+        with self.assertRaisesRegex(ValueError, "christofides"):
+            solver_ono.solve(cities, "christophides")
+
+
+class TestHilbert(unittest.TestCase):
+
+    def test_curve_visits_grid_cells_one_step_apart(self):
+        cells = [(x, y) for x in range(16) for y in range(16)]
+        keys = hilbert_keys(cells, order=4)
+        self.assertEqual(sorted(keys), list(range(256)))
+        path = [cells[i] for i in hilbert_tour(cells)]
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+
+    def test_renumbered_tours_map_back_to_input_indices(self):
+        cities = random_cities(200, 5)
+        tour = solve_renumbered(nearest_neighbor_tour, cities)
+        self.assertEqual(sorted(tour), list(range(200)))
+        # City 0 of the renumbered input is tour[0] of the original one.
+        self.assertEqual(tour, nearest_neighbor_tour(cities, tour[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from distance import DistanceOracle, distance_matrix
+
+
+class TestDistanceMatrix(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.cities = [(random.uniform(0, 1600), random.uniform(0, 900))
+                       for _ in range(50)]
+
+    def test_matches_math_dist(self):
+        dist = distance_matrix(self.cities)
+        self.assertEqual(dist.shape, (50, 50))
+        for i, a in enumerate(self.cities):
+            for j, b in enumerate(self.cities):
+                self.assertAlmostEqual(dist[i][j], math.dist(a, b))
+
+    def test_float32(self):
+        dist = distance_matrix(self.cities, dtype=np.float32)
+        self.assertEqual(dist.dtype, np.float32)
+        np.testing.assert_allclose(dist, distance_matrix(self.cities),
+                                   rtol=1e-6)
+
+    def test_falls_back_to_oracle(self):
+        dense = distance_matrix(self.cities)
+        oracle = distance_matrix(self.cities, max_dense=10)
+        self.assertIsInstance(oracle, DistanceOracle)
+        self.assertEqual(len(oracle), 50)
+        self.assertAlmostEqual(oracle[3][7], dense[3][7])
+        self.assertAlmostEqual(oracle[3, 7], dense[3, 7])
+        np.testing.assert_allclose(oracle[12], dense[12])
+        rows, cols = np.arange(10), np.arange(10, 20)
+        np.testing.assert_allclose(oracle[rows, cols], dense[rows, cols])
+
+
+class TestDistanceOracle(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1)
+        self.cities = [(random.uniform(0, 1600), random.uniform(0, 900))
+                       for _ in range(40)]
+        self.dense = distance_matrix(self.cities)
+
+    def test_cache_is_bounded_lru(self):
+        # Room for three rows of 40 float64 values.
+        oracle = DistanceOracle(self.cities, cache_bytes=3 * 40 * 8)
+        self.assertEqual(oracle.max_rows, 3)
+        for i in (0, 1, 2, 0, 3):
+            np.testing.assert_allclose(oracle[i], self.dense[i])
+        self.assertEqual(list(oracle.cache), [2, 0, 3])
+        self.assertEqual((oracle.hits, oracle.misses), (1, 4))
+
+    def test_rows_batch(self):
+        oracle = DistanceOracle(self.cities, dtype=np.float32)
+        block = oracle.rows([5, 9, 5])
+        self.assertEqual(block.shape, (3, 40))
+        self.assertEqual(block.dtype, np.float32)
+        np.testing.assert_allclose(block, self.dense[[5, 9, 5]], rtol=1e-6)
+        self.assertEqual(oracle.misses, 2)
+        self.assertAlmostEqual(oracle[9][4], self.dense[9][4], places=3)
+        self.assertEqual(oracle.hits, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
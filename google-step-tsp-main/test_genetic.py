@@ -0,0 +1,61 @@
+import os
+import time
+import unittest
+
+import numpy as np
+
+import solver_genetic
+from common import read_input
+from distance import distance_matrix
+from local_search import tour_length
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestGenetic(unittest.TestCase):
+
+    def test_crossover_and_mutation_keep_permutations(self):
+        rng = np.random.default_rng(1)
+        N = 50
+        parents1 = rng.random((20, N)).argsort(axis=1)
+        parents2 = rng.random((20, N)).argsort(axis=1)
+        children = solver_genetic.crossover(parents1, parents2, rng)
+        for child, p1, p2 in zip(children, parents1, parents2):
+            self.assertEqual(sorted(child), list(range(N)))
+            # The cities not taken from parent 1 keep parent 2's order.
+            same = np.flatnonzero(child == p1)
+            rest = [c for c in child if c not in set(p1[same])]
+            self.assertEqual(rest, [c for c in p2 if c in set(rest)])
+        mutated = solver_genetic.mutate(children.copy(), rng, 1.0)
+        for child in mutated:
+            self.assertEqual(sorted(child), list(range(N)))
+
+    def test_genetic_algorithm_returns_best_tour(self):
+        cities = read_input(os.path.join(HERE, 'input_2.csv'))
+        dist = distance_matrix(cities)
+        population = np.array([list(range(len(cities)))])
+        self.assertAlmostEqual(
+            solver_genetic.tour_lengths(population, dist)[0],
+            tour_length(list(range(len(cities))), cities))
+        tour = solver_genetic.genetic_algorithm(cities, dist, pop_size=20,
+                                                generations=20)
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+        self.assertLess(tour_length(tour, cities),
+                        tour_length(list(range(len(cities))), cities))
+
+    def test_short_deadline_on_a_large_input(self):
+        cities = read_input(os.path.join(HERE, 'input_6.csv'))
+        reported = []
+        start = time.time()
+        tour = solver_genetic.solve(
+            cities, deadline=start + 2.0,
+            callback=lambda tour, length: reported.append((time.time(), length)))
+        self.assertLess(time.time() - start, 10.0)
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+        # The first polished tour is reported before the deadline.
+        self.assertLess(reported[0][0], start + 2.0)
+        self.assertAlmostEqual(reported[-1][1], tour_length(tour, cities))
+
+
+if __name__ == '__main__':
+    unittest.main()
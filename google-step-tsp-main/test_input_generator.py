@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import input_generator
+from common import load_cities, read_input
+
+
+class TestInputGenerator(unittest.TestCase):
+
+    def test_distributions_are_deterministic_and_in_bounds(self):
+        for distribution in input_generator.DISTRIBUTIONS:
+            chunks = list(input_generator.generate_chunks(
+                2500, distribution, 100.0, 50.0, seed=3, chunk_size=1000))
+            self.assertEqual([len(c) for c in chunks], [1000, 1000, 500])
+            cities = np.concatenate(chunks)
+            self.assertTrue((cities >= 0).all())
+            self.assertTrue((cities <= [100.0, 50.0]).all())
+            # The cities do not depend on how they are chunked.
+            for chunk_size in (1000, 3000, 7):
+                again = np.concatenate(list(input_generator.generate_chunks(
+                    2500, distribution, 100.0, 50.0, seed=3,
+                    chunk_size=chunk_size)))
+                np.testing.assert_array_equal(cities, again)
+
+    def test_csv_and_npy_round_trip(self):
+        cities = np.concatenate(list(
+            input_generator.generate_chunks(300, 'clustered', seed=5)))
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('cities.csv', 'cities.npy'):
+                filename = os.path.join(tmp, name)
+                input_generator.write_cities(filename, len(cities),
+                                             [cities[:100], cities[100:]])
+                np.testing.assert_array_equal(load_cities(filename), cities)
+                self.assertEqual(read_input(filename),
+                                 [tuple(xy) for xy in cities.tolist()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import math
+import os
+import random
+import tempfile
+import time
+import unittest
+
+import solver_lk
+import solver_multistart
+import solver_sa
+from common import read_input
+from construction import nearest_neighbor_tour
+from local_search import (LocalSearch, improve, iterated_local_search,
+                          tour_length, two_opt)
+from neighbors import SpatialGrid, nearest_neighbors
+from tour import ArrayTour, TwoLevelTour
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestNeighbors(unittest.TestCase):
+
+    def test_nearest_neighbors_matches_brute_force(self):
+        random.seed(0)
+        cities = [(random.uniform(0, 100), random.uniform(0, 50))
+                  for _ in range(300)]
+        neighbors = nearest_neighbors(cities, k=5)
+        for i, city in enumerate(cities):
+            expected = sorted((j for j in range(len(cities)) if j != i),
+                              key=lambda j: math.dist(city, cities[j]))[:5]
+            self.assertEqual(neighbors[i], expected)
+
+    def test_nearest_neighbors_tiny_input(self):
+        self.assertEqual(nearest_neighbors([(0, 0)]), [[]])
+        self.assertEqual(nearest_neighbors([(0, 0), (1, 1)]), [[1], [0]])
+
+    def test_collinear_cities(self):
+        cities = [(float(i), 5.0) for i in range(2048)]
+        grid = SpatialGrid(cities)
+        self.assertLessEqual(grid.nx * grid.ny, len(cities))
+        neighbors = nearest_neighbors(cities, k=4)
+        self.assertEqual(sorted(neighbors[100]), [98, 99, 101, 102])
+        self.assertEqual(nearest_neighbor_tour(cities), list(range(2048)))
+
+    def test_cities_at_one_point(self):
+        cities = [(3.0, 4.0)] * 50
+        grid = SpatialGrid(cities)
+        self.assertEqual(grid.nx * grid.ny, 1)
+        for i, neighbors in enumerate(nearest_neighbors(cities, k=5)):
+            self.assertEqual(len(set(neighbors) - {i}), 5)
+        self.assertEqual(sorted(nearest_neighbor_tour(cities)), list(range(50)))
+
+
+def cycle_edges(tour):
+    order = tour.to_list()
+    return {frozenset((order[i - 1], order[i])) for i in range(len(order))}
+
+
+class TestTour(unittest.TestCase):
+
+    def test_two_level_tour_matches_array_tour(self):
+        random.seed(4)
+        for _ in range(20):
+            N = random.randint(10, 200)
+            order = list(range(N))
+            random.shuffle(order)
+            array_tour, two_level = ArrayTour(order), TwoLevelTour(order)
+            for _ in range(200):
+                a, c = random.sample(range(N), 2)
+                b, d = array_tour.next(a), array_tour.next(c)
+                if len({a, b, c, d}) < 4:
+                    continue
+                # Replace edges (a, b), (c, d) by (a, c), (b, d) in both.
+                for tour in (array_tour, two_level):
+                    if tour.next(a) == b:
+                        tour.reverse(b, c)
+                    else:
+                        tour.reverse(c, b)
+                self.assertEqual(cycle_edges(array_tour), cycle_edges(two_level))
+                order = two_level.to_list()
+                for i, city in enumerate(order):
+                    self.assertEqual(two_level.next(city), order[(i + 1) % N])
+                    self.assertEqual(two_level.prev(city), order[i - 1])
+                x, y, z = random.sample(range(N), 3)
+                i, j, k = order.index(x), order.index(y), order.index(z)
+                expected = i <= j <= k if i <= k else j >= i or j <= k
+                self.assertEqual(two_level.between(x, y, z), expected)
+
+
+class TestTwoOpt(unittest.TestCase):
+
+    def test_two_opt_removes_crossing(self):
+        # 0-1-2-3 visits the corners of a rectangle with crossing edges.
+        cities = [(0, 0), (10, 10), (10, 0), (0, 10), (5, 12), (5, -2)]
+        tour = two_opt([0, 1, 2, 3, 4, 5], cities)
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+        self.assertAlmostEqual(tour_length(tour, cities),
+                               tour_length([0, 5, 2, 1, 4, 3], cities))
+
+    def test_two_opt_improves_random_tour(self):
+        cities = read_input(os.path.join(HERE, 'input_5.csv'))
+        random.seed(1)
+        tour = list(range(len(cities)))
+        random.shuffle(tour)
+        before = tour_length(tour, cities)
+        tour = two_opt(tour, cities)
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+        self.assertLess(tour_length(tour, cities), before * 0.5)
+
+
+class TestOrOpt(unittest.TestCase):
+
+    def test_or_opt_keeps_cost_in_sync(self):
+        random.seed(2)
+        for _ in range(50):
+            N = random.randint(5, 40)
+            cities = [(random.random(), random.random()) for _ in range(N)]
+            tour = list(range(N))
+            random.shuffle(tour)
+            search = LocalSearch(tour, cities)
+            tour = search.optimize((search.try_or_opt,))
+            self.assertEqual(sorted(tour), list(range(N)))
+            self.assertAlmostEqual(search.cost.value,
+                                   tour_length(tour, cities))
+
+    def test_improve_beats_two_opt(self):
+        cities = read_input(os.path.join(HERE, 'input_5.csv'))
+        random.seed(1)
+        tour = list(range(len(cities)))
+        random.shuffle(tour)
+        two_opt_length = tour_length(two_opt(list(tour), cities), cities)
+        tour, cost = improve(tour, cities)
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+        self.assertAlmostEqual(cost, tour_length(tour, cities))
+        self.assertLess(cost, two_opt_length)
+
+
+class TestIteratedLocalSearch(unittest.TestCase):
+
+    def test_kicks_never_make_the_tour_worse(self):
+        cities = read_input(os.path.join(HERE, 'input_5.csv'))
+        start = nearest_neighbor_tour(cities)
+        _, local_optimum = improve(list(start), cities)
+        tour, cost = iterated_local_search(list(start), cities, iterations=300)
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+        self.assertAlmostEqual(cost, tour_length(tour, cities))
+        self.assertLess(cost, local_optimum)
+
+
+class TestLinKernighan(unittest.TestCase):
+
+    def test_lk_beats_two_opt_and_or_opt(self):
+        cities = read_input(os.path.join(HERE, 'input_5.csv'))
+        neighbors = nearest_neighbors(cities, solver_lk.NUM_NEIGHBORS)
+        start = nearest_neighbor_tour(cities)
+        _, improved = improve(list(start), cities, neighbors)
+        search = solver_lk.LinKernighan(list(start), cities, neighbors)
+        tour = search.optimize()
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+        self.assertAlmostEqual(search.cost.value, tour_length(tour, cities))
+        self.assertLess(search.cost.value, improved)
+
+    def test_solve_stops_when_kicks_stop_helping(self):
+        cities = read_input(os.path.join(HERE, 'input_2.csv'))
+        start = time.time()
+        tour = solver_lk.solve(cities, time_limit=30.0)
+        self.assertLess(time.time() - start, 10.0)
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+
+
+class TestMultiStart(unittest.TestCase):
+
+    def test_best_start_is_kept(self):
+        cities = read_input(os.path.join(HERE, 'input_4.csv'))
+        tour = solver_multistart.solve(cities, workers=2, starts=3)
+        self.assertEqual(sorted(tour), list(range(len(cities))))
+        neighbors = nearest_neighbors(cities, solver_lk.NUM_NEIGHBORS)
+        start = solver_multistart.initial_tour(cities, 0)
+        single = solver_lk.LinKernighan(start, cities, neighbors)
+        single.optimize()
+        self.assertLessEqual(tour_length(tour, cities),
+                             single.cost.value + 1e-6)
+
+
+class TestSimulatedAnnealing(unittest.TestCase):
+
+    def test_anneal_tracks_cost_and_writes_checkpoint(self):
+        cities = read_input(os.path.join(HERE, 'input_4.csv'))
+        start = nearest_neighbor_tour(cities)
+        search = solver_sa.SimulatedAnnealing(list(start), cities)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'best.csv')
+            best = search.anneal(time.time() + 1.0, checkpoint=path)
+            with open(path) as f:
+                saved = [int(line) for line in f.readlines()[1:]]
+        self.assertEqual(saved, best)
+        self.assertEqual(sorted(best), list(range(len(cities))))
+        self.assertAlmostEqual(search.best_value, tour_length(best, cities))
+        self.assertAlmostEqual(search.cost.value,
+                               tour_length(search.tour.to_list(), cities))
+        self.assertLessEqual(search.best_value, tour_length(start, cities))
+
+    def test_fixed_budgets_are_reproducible(self):
+        # Without a time limit, the budget alone decides where the search
+        # stops, so two runs give the same tour.
+        cities = read_input(os.path.join(HERE, 'input_4.csv'))
+        for solve, budget in ((solver_sa.solve, {'moves': 20_000}),
+                              (solver_lk.solve, {'kicks': 20})):
+            tour = solve(cities, time_limit=math.inf, **budget)
+            self.assertEqual(solve(cities, time_limit=math.inf, **budget), tour)
+
+
+if __name__ == '__main__':
+    unittest.main()
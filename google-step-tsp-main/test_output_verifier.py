@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import output_verifier
+from common import load_cities, read_input
+from local_search import tour_length
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestOutputVerifier(unittest.TestCase):
+
+    def test_permutation_check(self):
+        self.assertTrue(output_verifier.is_permutation(np.array([2, 0, 1]), 3))
+        self.assertFalse(output_verifier.is_permutation(np.array([2, 0, 0]), 3))
+        self.assertFalse(output_verifier.is_permutation(np.array([2, 0, 3]), 3))
+        self.assertFalse(output_verifier.is_permutation(np.array([-1, 0, 1]), 3))
+        self.assertFalse(output_verifier.is_permutation(np.array([0, 1]), 3))
+
+    def test_path_length_matches_tour_length(self):
+        filename = os.path.join(HERE, 'input_5.csv')
+        cities = read_input(filename)
+        tour = output_verifier.read_tour(
+            os.path.join(HERE, 'sample', 'greedy_5.csv'), len(cities))
+        self.assertAlmostEqual(
+            output_verifier.path_length(tour, load_cities(filename)),
+            tour_length(tour.tolist(), cities))
+
+    def test_malformed_tours_are_invalid(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        shutil.copy(os.path.join(HERE, 'input_0.csv'), tmp.name)
+        tours = {
+            'good': 'index\n0\n1\n2\n3\n4\n',
+            'word': 'index\n0\n1\nx\n3\n4\n',
+            'blank': 'index\n0\n1\n\n2\n3\n4\n',
+            'short': 'index\n0\n1\n2\n',
+            'header': '0\n1\n2\n3\n4\n',
+            'repeat': 'index\n0\n1\n1\n3\n4\n',
+        }
+        for name, text in tours.items():
+            with open(os.path.join(tmp.name, f'{name}_0.csv'), 'w') as f:
+                f.write(text)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        results = output_verifier.verify_challenge(0, tuple(tours) + ('none',))
+        lengths = {prefix: length for prefix, length, _ in results}
+        errors = {prefix: error for prefix, _, error in results}
+        self.assertGreater(lengths['good'], 0)
+        self.assertIsNone(lengths['none'])
+        for name in ('word', 'blank', 'short', 'header', 'repeat'):
+            self.assertTrue(np.isnan(lengths[name]), name)
+            self.assertTrue(errors[name], name)
+        self.assertIn('line 4', errors['blank'])
+        with self.assertRaises(ValueError):
+            output_verifier.read_tour('word_0.csv', 5)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
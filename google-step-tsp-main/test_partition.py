@@ -0,0 +1,41 @@
+import os
+import unittest
+
+import numpy as np
+
+import solver_partition
+from common import read_input
+from construction import nearest_neighbor_tour
+from local_search import tour_length
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestPartition(unittest.TestCase):
+
+    def setUp(self):
+        self.cities = read_input(os.path.join(HERE, 'input_5.csv'))
+
+    def test_partition_covers_every_city_once(self):
+        coords = np.array(self.cities)
+        clusters = solver_partition.partition(coords, 60)
+        self.assertTrue(all(len(c) <= 60 for c in clusters))
+        self.assertEqual(sorted(np.concatenate(clusters)),
+                         list(range(len(self.cities))))
+
+    def test_path_keeps_its_ends(self):
+        cities = self.cities[:100]
+        path = solver_partition.solve_path(cities, 17, 42)
+        self.assertEqual(sorted(path), list(range(100)))
+        self.assertEqual((path[0], path[-1]), (17, 42))
+
+    def test_solve_by_clusters(self):
+        tour = solver_partition.solve(self.cities, cluster_size=100, workers=1)
+        self.assertEqual(sorted(tour), list(range(len(self.cities))))
+        self.assertLess(tour_length(tour, self.cities),
+                        tour_length(nearest_neighbor_tour(self.cities),
+                                    self.cities))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+import math
+from array import array
+
+# Tours with at least this many cities use the two-level list.
+TWO_LEVEL_THRESHOLD = 1_000
+
+
+class ArrayTour:
+    """A tour stored as an order array plus a position index.
+
+    next/prev/between are O(1). reverse() flips the shorter of the path and
+    its complement, so it costs O(min(k, N - k)) for a path of k cities.
+    """
+
+    def __init__(self, order):
+        self.N = len(order)
+        self.order = array('i', order)
+        self.pos = array('i', bytes(4 * self.N))
+        for i, city in enumerate(order):
+            self.pos[city] = i
+
+    def __len__(self):
+        return self.N
+
+    def next(self, city):
+        i = self.pos[city] + 1
+        return self.order[i if i < self.N else 0]
+
+    def prev(self, city):
+        return self.order[self.pos[city] - 1]
+
+    def between(self, a, b, c):
+        """Return whether b is on the forward path from a to c."""
+        pos = self.pos
+        i, j, k = pos[a], pos[b], pos[c]
+        if i <= k:
+            return i <= j <= k
+        return j >= i or j <= k
+
+    def reverse(self, a, b):
+        """Reverse the forward path a..b (or, equivalently, its complement)."""
+        order, pos, N = self.order, self.pos, self.N
+        i, j = pos[a], pos[b]
+        length = (j - i) % N + 1
+        if 2 * length > N:
+            i, j = (j + 1) % N, (i - 1) % N
+            length = N - length
+        for _ in range(length // 2):
+            a, b = order[i], order[j]
+            order[i], pos[b] = b, i
+            order[j], pos[a] = a, j
+            i = i + 1 if i + 1 < N else 0
+            j = j - 1 if j > 0 else N - 1
+
+    def to_list(self):
+        return self.order.tolist()
+
+
+class TwoLevelTour:
+    """A tour split into about sqrt(N) segments, each with a reverse bit.
+
+    Every city knows its segment and its index inside that segment's array.
+    Reversing a path splits the segments at both ends, then reverses the run
+    of whole segments between them by reordering the segment list and
+    flipping their reverse bits, so no city inside those segments is touched.
+    next/prev/between stay O(1) and reverse() is O(sqrt(N)) amortized; the
+    segments are rebuilt once splitting has made too many of them.
+    """
+
+    def __init__(self, order):
+        self.N = len(order)
+        self.seg_of = array('i', bytes(4 * self.N))
+        self.index = array('i', bytes(4 * self.N))
+        self._build(list(order))
+
+    def _build(self, order):
+        N = self.N
+        size = max(8, int(math.sqrt(N)))
+        self.items = [array('i', order[i:i + size]) for i in range(0, N, size)]
+        self.reversed = [False] * len(self.items)
+        self.segs = list(range(len(self.items)))
+        self.rank = list(range(len(self.items)))
+        self.max_segs = 4 * len(self.items) + 4
+        for s in range(len(self.items)):
+            self._claim(s)
+
+    def _claim(self, s):
+        """Point the cities in items[s] at segment s."""
+        seg_of, index = self.seg_of, self.index
+        for i, city in enumerate(self.items[s]):
+            seg_of[city] = s
+            index[city] = i
+
+    def __len__(self):
+        return self.N
+
+    def _offset(self, city):
+        """Index of |city| along the forward direction of its segment."""
+        s = self.seg_of[city]
+        if self.reversed[s]:
+            return len(self.items[s]) - 1 - self.index[city]
+        return self.index[city]
+
+    def _first(self, s):
+        return self.items[s][-1] if self.reversed[s] else self.items[s][0]
+
+    def _last(self, s):
+        return self.items[s][0] if self.reversed[s] else self.items[s][-1]
+
+    def next(self, city):
+        s = self.seg_of[city]
+        i = self.index[city]
+        items = self.items[s]
+        if self.reversed[s]:
+            if i > 0:
+                return items[i - 1]
+        elif i + 1 < len(items):
+            return items[i + 1]
+        r = self.rank[s] + 1
+        return self._first(self.segs[r if r < len(self.segs) else 0])
+
+    def prev(self, city):
+        s = self.seg_of[city]
+        i = self.index[city]
+        items = self.items[s]
+        if self.reversed[s]:
+            if i + 1 < len(items):
+                return items[i + 1]
+        elif i > 0:
+            return items[i - 1]
+        return self._last(self.segs[self.rank[s] - 1])
+
+    def between(self, a, b, c):
+        """Return whether b is on the forward path from a to c."""
+        i = (self.rank[self.seg_of[a]], self._offset(a))
+        j = (self.rank[self.seg_of[b]], self._offset(b))
+        k = (self.rank[self.seg_of[c]], self._offset(c))
+        if i <= k:
+            return i <= j <= k
+        return j >= i or j <= k
+
+    def _split_before(self, city):
+        """Split segments so that |city| starts one; return its segment."""
+        s = self.seg_of[city]
+        f = self._offset(city)
+        if f == 0:
+            return s
+        items = self.items[s]
+        t = len(self.items)
+        if self.reversed[s]:
+            # Forward order is items reversed: the head of the forward order
+            # is items[i + 1:], and city starts the tail items[:i + 1].
+            i = self.index[city]
+            self.items.append(items[i + 1:])
+            del items[i + 1:]
+            head, tail = t, s
+        else:
+            self.items.append(items[f:])
+            del items[f:]
+            head, tail = s, t
+        self.reversed.append(self.reversed[s])
+        self.rank.append(0)
+        r = self.rank[s]
+        self.segs[r:r + 1] = [head, tail]
+        for rank in range(r, len(self.segs)):
+            self.rank[self.segs[rank]] = rank
+        self._claim(t)
+        return self.seg_of[city]
+
+    def reverse(self, a, b):
+        """Reverse the forward path a..b (or, equivalently, its complement)."""
+        if a == b:
+            return
+        s, t = self.seg_of[a], self.seg_of[b]
+        fa, fb = self._offset(a), self._offset(b)
+        if s == t and fa < fb:
+            self._reverse_inside(s, fa, fb)
+            return
+        after = self.next(b)
+        if after == a:
+            return  # the whole tour
+        self._split_before(a)
+        self._split_before(after)
+        first = self.seg_of[a]
+        last = self.seg_of[b]
+        lo, hi = self.rank[first], self.rank[last]
+        if lo > hi:
+            # The path wraps around the segment list; its complement doesn't.
+            lo, hi = hi + 1, lo - 1
+        segs, rank, rev = self.segs, self.rank, self.reversed
+        segs[lo:hi + 1] = segs[lo:hi + 1][::-1]
+        for r in range(lo, hi + 1):
+            seg = segs[r]
+            rank[seg] = r
+            rev[seg] = not rev[seg]
+        if len(segs) > self.max_segs:
+            self._build(self.to_list())
+
+    def _reverse_inside(self, s, fa, fb):
+        """Reverse forward offsets fa..fb of a single segment in place."""
+        items = self.items[s]
+        if self.reversed[s]:
+            n = len(items) - 1
+            fa, fb = n - fb, n - fa
+        items[fa:fb + 1] = items[fa:fb + 1][::-1]
+        index = self.index
+        for i in range(fa, fb + 1):
+            index[items[i]] = i
+
+    def to_list(self):
+        order = []
+        for s in self.segs:
+            items = self.items[s]
+            order.extend(reversed(items) if self.reversed[s] else items)
+        return order
+
+
+def make_tour(order, two_level_threshold=None):
+    """Return the tour structure best suited to the size of |order|."""
+    if two_level_threshold is None:
+        two_level_threshold = TWO_LEVEL_THRESHOLD
+    if len(order) >= two_level_threshold:
+        return TwoLevelTour(order)
+    return ArrayTour(order)
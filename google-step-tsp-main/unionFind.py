@@ -1,27 +1,73 @@
+from array import array
+
+
 class unionFind:
+  # Parents and set sizes live in typed arrays instead of lists of boxed
+  # ints. Sets are joined by size. |self.components| counts the sets left.
   def __init__(self,n):
-    self.par = [-1]*n
-    self.rank = [0]*n
-    self.size = [1]*n
-  
+    self.par = array('i', range(n))
+    self.size = array('i', [1])*n
+    self.components = n
+
+  # Iterative path halving: every visited node is pointed at its
+  # grandparent, so there is no recursion limit to hit.
   def root(self,x):
-    if self.par[x]==-1: return x
-    else:
-      self.par[x] = self.root(self.par[x])
-      return self.par[x]
-    
+    par = self.par
+    p = par[x]
+    while p!=x:
+      g = par[p]
+      par[x] = g
+      x = g
+      p = par[x]
+    return x
+
   def unite(self,x,y):
     x = self.root(x)
     y = self.root(y)
     if x==y: return False
-    if self.rank[x]<self.rank[y]:
+    size = self.size
+    if size[x]<size[y]:
       x,y = y,x
-    if self.rank[x]==self.rank[y]:
-      self.rank[x] += 1
-    self.size[x] += self.size[y]
+    size[x] += size[y]
     self.par[y] = x
+    self.components -= 1
     return True
-  
+
   def same(self,x,y):
     return self.root(x)==self.root(y)
-  
+
+  # Unite every pair (xs[i], ys[i]) in order; return for each pair whether
+  # it joined two different sets. Same as calling unite() in a loop, minus
+  # the per-call overhead.
+  def unite_many(self,xs,ys):
+    par, size = self.par, self.size
+    merged = []
+    append = merged.append
+    for x,y in zip(xs,ys):
+      p = par[x]
+      while p!=x:
+        g = par[p]
+        par[x] = g
+        x = g
+        p = par[x]
+      p = par[y]
+      while p!=y:
+        g = par[p]
+        par[y] = g
+        y = g
+        p = par[y]
+      if x==y:
+        append(False)
+        continue
+      if size[x]<size[y]:
+        x,y = y,x
+      size[x] += size[y]
+      par[y] = x
+      append(True)
+    self.components -= merged.count(True)
+    return merged
+
+  # Return for each pair (xs[i], ys[i]) whether both are in the same set.
+  def same_many(self,xs,ys):
+    root = self.root
+    return [root(x)==root(y) for x,y in zip(xs,ys)]